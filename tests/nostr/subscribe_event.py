@@ -1,6 +1,7 @@
+import asyncio
 import sys
+import time
 from pathlib import Path
-import queue
 from datetime import datetime
 import logging
 
@@ -40,28 +41,53 @@ print(f"Relays: {relays}")
 print("Press Ctrl+C to exit\n")
 print("Waiting for events...")
 
-event_channel = pub.get_event_channel()
-heart_beat_counter = 0
-while True:
-    try:
-        ev = event_channel.get(timeout=5)
-        event_time = datetime.fromtimestamp(ev.created_at).strftime('%Y-%m-%d %H:%M:%S')
-        print(f"\n{'='*60}")
-        print(f"✓ RECEIVED EVENT")
-        print(f"{'='*60}")
-        print(f"Kind: {ev.kind}")
-        print(f"ID: {ev.id}")
-        print(f"From: {getattr(ev, 'pubkey', '')}")
-        print(f"Created at: {event_time} (timestamp: {ev.created_at})")
-        content_display = ev.content[:200] + "..." if len(ev.content) > 200 else ev.content
-        print(f"Content: {content_display}")
-        print(f"Tags: {ev.tags}")
-        print(f"{'='*60}\n")
-    except queue.Empty:
-        heart_beat_counter += 1
-        if heart_beat_counter % 6 == 0:
+HEARTBEAT_SECONDS = 30
+
+
+def format_event(ev) -> str:
+    event_time = datetime.fromtimestamp(ev.created_at).strftime('%Y-%m-%d %H:%M:%S')
+    content_display = ev.content[:200] + "..." if len(ev.content) > 200 else ev.content
+    return (
+        f"\n{'='*60}\n"
+        f"✓ RECEIVED EVENT\n"
+        f"{'='*60}\n"
+        f"Kind: {ev.kind}\n"
+        f"ID: {ev.id}\n"
+        f"From: {getattr(ev, 'pubkey', '')}\n"
+        f"Created at: {event_time} (timestamp: {ev.created_at})\n"
+        f"Content: {content_display}\n"
+        f"Tags: {ev.tags}\n"
+        f"{'='*60}\n\n"
+    )
+
+
+async def heartbeat(state: dict) -> None:
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        if time.monotonic() - state['last_event'] >= HEARTBEAT_SECONDS:
             print(f"[{datetime.now().strftime('%H:%M:%S')}] Still listening... (no events yet)")
-        continue
-    except KeyboardInterrupt:
-        print("\nShutting down...")
-        break
\ No newline at end of file
+
+
+async def consume() -> None:
+    state = {'last_event': time.monotonic()}
+    heartbeat_task = asyncio.create_task(heartbeat(state))
+    try:
+        async for ev in pub.events():
+            state['last_event'] = time.monotonic()
+            sys.stdout.write(format_event(ev))
+            sys.stdout.flush()
+    finally:
+        heartbeat_task.cancel()
+
+
+try:
+    import uvloop  # type: ignore
+
+    uvloop.install()
+except ImportError:
+    pass
+
+try:
+    asyncio.run(consume())
+except KeyboardInterrupt:
+    print("\nShutting down...")
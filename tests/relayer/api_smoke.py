@@ -4,12 +4,15 @@ Simple REST smoke tests for the relayer.
 Set RELAYER_BASE_URL (default http://localhost:8080) and optionally RELAYER_SETTLEMENT_TOKEN.
 Optional trade exercise: set RELAYER_TEST_TX_HASH plus RELAYER_TEST_BOT_PK; follower/role/symbol/side/size/price optional.
 """
-import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = os.getenv("RELAYER_BASE_URL", "http://localhost:8080").rstrip("/")
 SETTLEMENT_TOKEN = os.getenv("RELAYER_SETTLEMENT_TOKEN")
@@ -22,6 +25,13 @@ LEADER_NOSTR = os.getenv("RELAYER_LEADER_NOSTR_PUB", "npub1leaderdemo")
 FOLLOWER_NOSTR = os.getenv("RELAYER_FOLLOWER_NOSTR_PUB", "npub1followdemo")
 SUB_SHARED_SECRET = os.getenv("RELAYER_SUB_SHARED_SECRET", "shared_secret_demo")
 
+# Shared keep-alive session so every call reuses the same pooled connection
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "relayer-smoke"})
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.1))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 
 def call(method: str, path: str, *, include_token: bool = False, **kwargs):
     url = f"{BASE_URL}{path}"
@@ -29,7 +39,7 @@ def call(method: str, path: str, *, include_token: bool = False, **kwargs):
     if include_token and SETTLEMENT_TOKEN:
         headers.setdefault("X-Settlement-Token", SETTLEMENT_TOKEN)
     try:
-        resp = requests.request(method, url, headers=headers, timeout=TIMEOUT, **kwargs)
+        resp = SESSION.request(method, url, headers=headers, timeout=TIMEOUT, **kwargs)
         return resp
     except Exception as exc:
         print(f"[FAIL] {method.upper()} {url} error: {exc}")
@@ -45,11 +55,18 @@ def expect_ok(resp, label: str) -> None:
 
 
 def smoke_core() -> None:
-    expect_ok(call("get", "/health"), "health")
-    expect_ok(call("get", "/status"), "status")
-    expect_ok(call("get", "/api/metrics/summary"), "metrics summary")
-    expect_ok(call("get", "/api/metrics/memory"), "memory")
-    expect_ok(call("get", "/api/credits"), "credits")
+    endpoints = [
+        ("get", "/health", "health"),
+        ("get", "/status", "status"),
+        ("get", "/api/metrics/summary", "metrics summary"),
+        ("get", "/api/metrics/memory", "memory"),
+        ("get", "/api/credits", "credits"),
+    ]
+    # Independent GETs: dispatch together, then check in order
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as ex:
+        futures = [ex.submit(call, method, path) for method, path, _ in endpoints]
+        for future, (_, _, label) in zip(futures, endpoints):
+            expect_ok(future.result(), label)
 
 
 def register_bots_and_subscription() -> None:
@@ -64,7 +81,7 @@ def register_bots_and_subscription() -> None:
         "post",
         "/api/bots/register",
         headers={"Content-Type": "application/json"},
-        data=json.dumps(leader_payload),
+        data=orjson.dumps(leader_payload),
     )
     expect_ok(resp, "register leader bot")
 
@@ -79,7 +96,7 @@ def register_bots_and_subscription() -> None:
         "post",
         "/api/bots/register",
         headers={"Content-Type": "application/json"},
-        data=json.dumps(follower_payload),
+        data=orjson.dumps(follower_payload),
     )
     expect_ok(resp, "register follower bot")
 
@@ -93,7 +110,7 @@ def register_bots_and_subscription() -> None:
         "post",
         "/api/subscriptions",
         headers={"Content-Type": "application/json"},
-        data=json.dumps(sub_payload),
+        data=orjson.dumps(sub_payload),
     )
     expect_ok(resp, "subscription follower->leader")
 
@@ -129,7 +146,7 @@ def maybe_exercise_trade() -> None:
         "/api/trades/record",
         include_token=True,
         headers={"Content-Type": "application/json"},
-        data=json.dumps(record_payload),
+        data=orjson.dumps(record_payload),
     )
     expect_ok(resp, "record trade")
 
@@ -144,7 +161,7 @@ def maybe_exercise_trade() -> None:
         "/api/trades/settlement",
         include_token=True,
         headers={"Content-Type": "application/json"},
-        data=json.dumps(settlement_payload),
+        data=orjson.dumps(settlement_payload),
     )
     expect_ok(resp, "settlement update")
 
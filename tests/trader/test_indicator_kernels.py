@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Equivalence checks for strategies/indicators.py against the `ta` indicators
+the strategies used before, and for analyze_series() against analyze() bar by bar.
+Runs under pytest or directly: python tests/trader/test_indicator_kernels.py
+"""
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "trader"))
+
+from ta.momentum import RSIIndicator  # noqa: E402
+from ta.trend import MACD  # noqa: E402
+from ta.volatility import BollingerBands  # noqa: E402
+
+from strategies import indicators  # noqa: E402
+from strategies.strategies import MeanReversionStrategy, MomentumStrategy  # noqa: E402
+
+TOL = 1e-6
+
+
+def _closes(n: int = 600, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 2500.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+
+
+def _assert_close(actual, expected, label: str) -> None:
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    assert np.array_equal(np.isnan(actual), np.isnan(expected)), f"{label}: NaN positions differ"
+    ok = ~np.isnan(expected)
+    assert np.allclose(actual[ok], expected[ok], rtol=TOL, atol=TOL), f"{label}: values differ"
+
+
+def test_rsi_matches_ta() -> None:
+    close = _closes()
+    expected = RSIIndicator(pd.Series(close), window=14).rsi().to_numpy()
+    for end in (30, 100, len(close)):
+        _assert_close(indicators.rsi(close[:end], 14), expected[end - 1], f"rsi[:{end}]")
+
+
+def test_macd_matches_ta() -> None:
+    close = _closes()
+    ta_macd = MACD(pd.Series(close), window_slow=26, window_fast=12, window_sign=9)
+    expected_line = ta_macd.macd().to_numpy()
+    expected_signal = ta_macd.macd_signal().to_numpy()
+    # Short histories take the full-series path, long ones the truncated window
+    for end in (50, 200, len(close)):
+        line_last, sig_last = indicators.macd(close[:end], 12, 26, 9)
+        _assert_close(line_last, expected_line[end - 1], f"macd[:{end}] line")
+        _assert_close(sig_last, expected_signal[end - 1], f"macd[:{end}] signal")
+
+
+def test_bollinger_matches_ta() -> None:
+    close = _closes()
+    bb = BollingerBands(pd.Series(close), window=20, window_dev=2)
+    expected = (bb.bollinger_hband().to_numpy(), bb.bollinger_mavg().to_numpy(), bb.bollinger_lband().to_numpy())
+    for end in (20, 100, len(close)):
+        for name, got, want in zip(("upper", "middle", "lower"), indicators.bollinger(close[:end], 20, 2), expected):
+            _assert_close(got, want[end - 1], f"bollinger[:{end}] {name}")
+
+
+def test_series_kernels_match_ta() -> None:
+    close = _closes()
+    series = pd.Series(close)
+    _assert_close(indicators.rsi_series(close, 14), RSIIndicator(series, window=14).rsi(), "rsi_series")
+    ta_macd = MACD(series, window_slow=26, window_fast=12, window_sign=9)
+    line, sig = indicators.macd_series(close, 12, 26, 9)
+    _assert_close(line, ta_macd.macd(), "macd_series line")
+    _assert_close(sig, ta_macd.macd_signal(), "macd_series signal")
+    bb = BollingerBands(series, window=20, window_dev=2)
+    expected = (bb.bollinger_hband(), bb.bollinger_mavg(), bb.bollinger_lband())
+    for name, got, want in zip(("upper", "middle", "lower"), indicators.bollinger_series(close, 20, 2), expected):
+        _assert_close(got, want, f"bollinger_series {name}")
+
+
+def _check_analyze_series(strategy, df: pd.DataFrame, indicator_columns) -> None:
+    series = strategy.analyze_series(df)
+    for i in range(len(df)):
+        bar = strategy.analyze(df.iloc[:i + 1])
+        row = series.iloc[i]
+        assert row['signal'] == bar['signal'], f"{strategy.name} bar {i}: signal differs"
+        assert math.isclose(row['strength'], bar['strength'], rel_tol=TOL, abs_tol=TOL), \
+            f"{strategy.name} bar {i}: strength differs"
+        for column, key in indicator_columns:
+            if 'indicators' in bar:
+                _assert_close(row[column], bar['indicators'][key], f"{strategy.name} bar {i} {column}")
+
+
+def test_momentum_analyze_series_matches_analyze() -> None:
+    df = pd.DataFrame({'close': _closes(300, seed=11)})
+    strategy = MomentumStrategy({})
+    _check_analyze_series(strategy, df, [('rsi', 'rsi'), ('macd', 'macd'), ('macd_signal', 'signal')])
+
+
+def test_mean_reversion_analyze_series_matches_analyze() -> None:
+    df = pd.DataFrame({'close': _closes(300, seed=13)})
+    strategy = MeanReversionStrategy({})
+    _check_analyze_series(strategy, df, [
+        ('upper_band', 'upper_band'), ('lower_band', 'lower_band'),
+        ('middle_band', 'middle_band'), ('rsi', 'rsi'),
+    ])
+
+
+def main() -> None:
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
+    print("[DONE] indicator kernel checks passed")
+
+
+if __name__ == "__main__":
+    main()
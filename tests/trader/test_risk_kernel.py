@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Checks for risk.evaluate_risk: the numba-compiled kernel must agree with its
+plain-Python body, and each close reason must fire where check_risk_management
+used to trigger it.
+Runs under pytest or directly: python tests/trader/test_risk_kernel.py
+"""
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "trader"))
+
+import risk  # noqa: E402
+
+TOL = 1e-9
+
+
+def test_evaluate_risk_compiled_matches_python() -> None:
+    py_func = getattr(risk.evaluate_risk, 'py_func', None)
+    if py_func is None:
+        print("[SKIP] numba not installed; evaluate_risk already runs as plain Python")
+        return
+    rng = np.random.default_rng(3)
+    for _ in range(2000):
+        entry = float(rng.uniform(100.0, 5000.0))
+        args = (
+            bool(rng.integers(2)),
+            entry,
+            entry * float(rng.uniform(0.9, 1.1)),
+            float(rng.uniform(0.0, 48.0)),
+            math.nan if rng.random() < 0.5 else float(rng.uniform(0.0, 0.1)),
+            0.0 if rng.random() < 0.5 else float(rng.uniform(0.0, 0.05)) * entry,
+            0.0 if rng.random() < 0.5 else float(rng.uniform(0.0, 0.08)) * entry,
+            0.03, 0.05, 0.02, 24.0,
+            int(rng.integers(3)),
+            float(rng.uniform(0.0, 1.0)),
+        )
+        compiled = risk.evaluate_risk(*args)
+        expected = py_func(*args)
+        assert compiled[0] == expected[0], f"reason differs for {args}"
+        for got, want in zip(compiled[1:], expected[1:]):
+            assert (math.isnan(got) and math.isnan(want)) or math.isclose(got, want, rel_tol=TOL, abs_tol=TOL), \
+                f"values differ for {args}"
+
+
+def test_evaluate_risk_reasons() -> None:
+    base = dict(stop_loss_atr=0.0, take_profit_atr=0.0, fixed_stop_loss=0.03, fixed_take_profit=0.05,
+                trailing_stop=0.02, max_holding_hours=24.0)
+
+    def reason(is_long, current, hours=0.0, max_pnl=math.nan, signal=risk.SIGNAL_HOLD, strength=0.0, **kw):
+        p = dict(base, **kw)
+        return risk.evaluate_risk(is_long, 100.0, current, hours, max_pnl, p['stop_loss_atr'],
+                                  p['take_profit_atr'], p['fixed_stop_loss'], p['fixed_take_profit'],
+                                  p['trailing_stop'], p['max_holding_hours'], signal, strength)[0]
+
+    assert reason(True, 100.0) == risk.REASON_NONE
+    assert reason(True, 96.0) == risk.REASON_FIXED_STOP_LOSS
+    assert reason(False, 106.0) == risk.REASON_FIXED_STOP_LOSS
+    assert reason(True, 106.0) == risk.REASON_FIXED_TAKE_PROFIT
+    assert reason(True, 98.0, stop_loss_atr=1.5) == risk.REASON_DYNAMIC_STOP_LOSS
+    assert reason(True, 104.0, take_profit_atr=3.0) == risk.REASON_DYNAMIC_TAKE_PROFIT
+    assert reason(True, 104.0, max_pnl=0.08) == risk.REASON_TRAILING_STOP
+    assert reason(True, 98.5, hours=30.0) == risk.REASON_TIME_STOP
+    assert reason(True, 100.0, signal=risk.SIGNAL_SELL, strength=0.7) == risk.REASON_REVERSE_SELL
+    assert reason(False, 100.0, signal=risk.SIGNAL_BUY, strength=0.7) == risk.REASON_REVERSE_BUY
+
+
+def main() -> None:
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
+    print("[DONE] risk kernel checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Optional numba JIT.
+
+`njit` is numba's decorator when numba is installed and a no-op otherwise,
+so kernels run as plain Python without it. Import it from here rather than
+from numba directly.
+"""
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+__all__ = ["njit"]
@@ -9,42 +9,80 @@ import numpy as np
 import pandas as pd
 from trader.strategies.strategies import get_strategy
 
+# Bars handed to the strategy per step; covers the longest indicator lookback (EMA-200)
+DEFAULT_ANALYSIS_WINDOW = 300
+# Initial capacity of the columnar trade/equity buffers (doubled when full)
+INITIAL_BUFFER_SIZE = 1024
+
+
+def _append(buf: np.ndarray, n: int, value: float) -> np.ndarray:
+    """Store value at buf[n], doubling capacity when full (amortized O(1))"""
+    if n == len(buf):
+        grown = np.empty(len(buf) * 2, dtype=buf.dtype)
+        grown[:n] = buf
+        buf = grown
+    buf[n] = value
+    return buf
+
+
 class Backtester:
     def __init__(self, config: Dict, initial_balance: float = 10000):
         self.config = config
         self.initial_balance = initial_balance
         self.balance = initial_balance
         self.positions = []
-        self.trades = []
-        self.equity_curve = []
+
+        # Columnar storage: per-trade PnL and per-step equity
+        self._trade_pnl = np.empty(INITIAL_BUFFER_SIZE, dtype=np.float64)
+        self._trade_n = 0
+        self._equity = np.empty(INITIAL_BUFFER_SIZE, dtype=np.float64)
+        self._equity_n = 0
+
+    @property
+    def trades(self) -> np.ndarray:
+        """PnL of each closed trade"""
+        return self._trade_pnl[:self._trade_n]
+
+    @property
+    def equity_curve(self) -> np.ndarray:
+        """Account equity at each recorded step"""
+        return self._equity[:self._equity_n]
+
+    def append_trade(self, pnl: float):
+        """Record a closed trade's PnL"""
+        self._trade_pnl = _append(self._trade_pnl, self._trade_n, pnl)
+        self._trade_n += 1
+
+    def record_equity(self, equity: float):
+        """Record account equity for the current step"""
+        self._equity = _append(self._equity, self._equity_n, equity)
+        self._equity_n += 1
 
     def load_historical_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         """Load historical data (using simulated data here, actual data should be fetched from the exchange)"""
         # Generate simulated data
         dates = pd.date_range(start=start_date, end=end_date, freq='1h')
+        n = len(dates)
+        rng = np.random.default_rng()
 
         # Simulate price movements - add volatility and trends
-        price = 100
-        prices = []
-        trend = 0
-
-        for i, _ in enumerate(dates):
-            # Change trend every 100 periods
-            if i % 100 == 0:
-                trend = np.random.choice([-1, 1])
-            price += trend * np.random.uniform(-1, 1)
-            prices.append(price)
+        # Change trend every 100 periods
+        deltas = rng.uniform(-1.0, 1.0, n)
+        trend_segments = rng.choice(np.array([-1, 1], dtype=np.int8), size=(n + 99) // 100)
+        trend = np.repeat(trend_segments, 100)[:n]
+        prices = 100.0 + np.cumsum(trend.astype(np.float64) * deltas)
 
+        # Strategies consume DataFrames, so wrap the arrays without consolidating/copying them
         df = pd.DataFrame({
             'timestamp': dates,
             'open': prices,
-            'high': [p * 1.03 for p in prices],
-            'low': [p * 0.97 for p in prices],
+            'high': prices * 1.03,
+            'low': prices * 0.97,
             'close': prices,
-            'volume': np.random.uniform(1000, 10000, len(dates))
-        })
+            'volume': rng.uniform(1000, 10000, n)
+        }, copy=False)
 
-        print(f"Generated {len(df)} data points, price range: ${df['close'].min():.2f} - ${df['close'].max():.2f}")
+        print(f"Generated {n} data points, price range: ${prices.min():.2f} - ${prices.max():.2f}")
 
         return df
 
@@ -60,11 +98,20 @@ class Backtester:
         strategy = get_strategy(strategy_name, self.config)
 
         position = None
-
-        # Iterate through data row by row
-        for i in range(50, len(df)):
-            signal = strategy.analyze(df.iloc[:i])
-            # Process signals and manage positions
+        window = getattr(strategy, 'required_window', DEFAULT_ANALYSIS_WINDOW)
+
+        analyze_series = getattr(strategy, 'analyze_series', None)
+        if analyze_series is not None:
+            # One vectorized pass over the history; row i - 1 is what analyze() sees at step i
+            signals = analyze_series(df).to_dict('records')
+            for i in range(50, len(df)):
+                signal = signals[i - 1]
+                # Process signals and manage positions
+        else:
+            # Iterate through data row by row, analyzing a fixed-size trailing window
+            for i in range(50, len(df)):
+                signal = strategy.analyze(df.iloc[max(0, i - window):i])
+                # Process signals and manage positions
 
         # Calculate statistics
         return self.calculate_statistics()
@@ -73,30 +120,35 @@ class Backtester:
         """Calculate backtest statistics"""
         total_return = (self.balance - self.initial_balance) / self.initial_balance
 
-        if not self.trades:
+        if not self._trade_n:
             return {}
 
-        winning_trades = [t for t in self.trades if t['pnl'] > 0]
-        win_rate = len(winning_trades) / len(self.trades)
+        total_trades = self._trade_n
+        pnl = self.trades
+        win_mask = pnl > 0
+        winning_trades = int(win_mask.sum())
+        losing_trades = total_trades - winning_trades
+        win_rate = winning_trades / total_trades
 
-        avg_win = np.mean([t['pnl'] for t in winning_trades]) if winning_trades else 0
-        losing_trades = [t for t in self.trades if t['pnl'] <= 0]
-        avg_loss = np.mean([t['pnl'] for t in losing_trades]) if losing_trades else 0
+        avg_win = pnl[win_mask].mean() if winning_trades else 0
+        avg_loss = pnl[~win_mask].mean() if losing_trades else 0
 
         # Maximum drawdown
-        equity_series = pd.Series([e['equity'] for e in self.equity_curve])
-        cummax = equity_series.cummax()
-        drawdown = (equity_series - cummax) / cummax
-        max_drawdown = drawdown.min()
+        equity = self.equity_curve
+        if equity.size:
+            cummax = np.maximum.accumulate(equity)
+            max_drawdown = ((equity - cummax) / cummax).min()
+        else:
+            max_drawdown = float('nan')
 
         stats = {
             'initial_balance': self.initial_balance,
             'final_balance': self.balance,
             'total_return': total_return,
             'total_return_percent': f"{total_return:.2%}",
-            'total_trades': len(self.trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
+            'total_trades': total_trades,
+            'winning_trades': winning_trades,
+            'losing_trades': losing_trades,
             'win_rate': win_rate,
             'win_rate_percent': f"{win_rate:.2%}",
             'avg_win': avg_win,
@@ -148,8 +200,8 @@ if __name__ == "__main__":
     with open('backtest_results.json', 'w') as f:
         json.dump({
             'statistics': stats,
-            'trades': backtester.trades,
-            'equity_curve': backtester.equity_curve
+            'trades': backtester.trades.tolist(),
+            'equity_curve': backtester.equity_curve.tolist()
         }, f, indent=2, default=str)
 
     print("\nDetailed results saved to backtest_results.json")
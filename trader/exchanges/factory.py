@@ -5,20 +5,27 @@ Keeps the bot decoupled from a specific venue so we can add new
 adapters (e.g., polymarket, other DEXes) without touching core logic.
 """
 
+import functools
 from typing import Any, Dict
 
 from hyperliquid_api import HyperliquidClient
 
 
-def get_exchange_client(config: Dict[str, Any], *, test_mode: bool = False):
-    trading_cfg = config.get("trading", {})
-    venue = trading_cfg.get("exchange", "hyperliquid").lower()
-
+@functools.lru_cache(maxsize=8)
+def _build_client(venue: str, wallet_address: str, private_key: str, test_mode: bool):
+    # Clients are keyed on the identity fields only, so bots sharing a wallet
+    # reuse one client and its pooled connections.
     if venue == "hyperliquid":
         return HyperliquidClient(
-            wallet_address=config["wallet_address"],
-            private_key=config["private_key"],
+            wallet_address=wallet_address,
+            private_key=private_key,
             testnet=test_mode,
         )
 
     raise ValueError(f"Unsupported exchange '{venue}'. Add an adapter in exchanges.factory.")
+
+
+def get_exchange_client(config: Dict[str, Any], *, test_mode: bool = False):
+    trading_cfg = config.get("trading", {})
+    venue = trading_cfg.get("exchange", "hyperliquid").lower()
+    return _build_client(venue, config["wallet_address"], config["private_key"], test_mode)
@@ -3,16 +3,18 @@
 Generate a new Ethereum wallet
 For the Hyperliquid trading bot
 """
+import os
+
 from eth_account import Account
-import secrets
 
 def generate_wallet():
     """Generate a new wallet"""
     # Generate a random private key
-    private_key = "0x" + secrets.token_hex(32)
+    private_key_bytes = os.urandom(32)
 
-    # Create an account from the private key
-    account = Account.from_key(private_key)
+    # Create an account from the raw key bytes; hex is only needed for display
+    account = Account.from_key(private_key_bytes)
+    private_key = "0x" + private_key_bytes.hex()
 
     print("=" * 60)
     print("🎉 New Wallet Generated!")
@@ -1,12 +1,77 @@
 """
 Hyperliquid API Client - Using the Official SDK
 """
+import functools
+import logging
+import math
 import time
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from eth_account import Account
 
+logger = logging.getLogger(__name__)
+
+# Asset metadata (szDecimals etc.) rarely changes; mark prices go stale quickly
+META_TTL_SECONDS = 3600
+MARK_PRICE_TTL_SECONDS = 1.0
+# Back-to-back account queries within this window share one user_state() call
+USER_STATE_TTL_SECONDS = 0.5
+
+# Candle interval -> seconds
+_INTERVAL_SECONDS = MappingProxyType({
+    '1m': 60,
+    '3m': 180,
+    '5m': 300,
+    '15m': 900,
+    '30m': 1800,
+    '1h': 3600,
+    '2h': 7200,
+    '4h': 14400,
+    '1d': 86400
+})
+
+# HTTP connection pool sizing for the SDK sessions
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 32
+
+# Minimum order size per szDecimals (10 ** -d)
+_MIN_SIZE_BY_DECIMALS = tuple(10 ** -d for d in range(9))
+
+
+@functools.lru_cache(maxsize=64)
+def _candle_window_ms(interval: str, limit: int) -> int:
+    """Span in milliseconds covered by `limit` candles of `interval`"""
+    return limit * _INTERVAL_SECONDS.get(interval, 60) * 1000
+
+
+def _candle_row(candle: Dict) -> tuple:
+    """Unified candle row: timestamp, open, high, low, close, volume"""
+    return (
+        candle['t'],  # timestamp
+        candle['o'],  # open
+        candle['h'],  # high
+        candle['l'],  # low
+        candle['c'],  # close
+        candle.get('v', 0)  # volume
+    )
+
+
+def _mount_pooled_adapter(api, max_retries) -> None:
+    """Give an SDK client's requests.Session a larger keep-alive pool"""
+    session = getattr(api, 'session', None)
+    if session is None:
+        return
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
 class HyperliquidClient:
     def __init__(self, wallet_address: str, private_key: str, testnet: bool = False):
         """Initialize the client"""
@@ -27,19 +92,53 @@ class HyperliquidClient:
 
         self.info = Info(base_url=base_url)
 
-    def get_market_data(self, symbol: str) -> Dict:
-        """Fetch market data"""
+        # Info endpoints are read-only POSTs and safe to retry; order placement is not
+        _mount_pooled_adapter(self.info, Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset({"GET", "POST"}),
+        ))
+        _mount_pooled_adapter(self.exchange, 0)
+
+        # Cached meta() universe indexed by asset name
+        self._meta_index: Dict[str, dict] = {}
+        self._meta_ts = 0.0
+        # {symbol: (timestamp, mark_price)}
+        self._mark_cache: Dict[str, tuple] = {}
+
+        # Short-lived user_state() snapshot
+        self._state_cache: Optional[Dict] = None
+        self._state_ts = 0.0
+
+    def _refresh_meta(self) -> None:
+        """Fetch meta() and rebuild the asset index"""
+        meta = self.info.meta()
+        self._meta_index = {asset.get('name'): asset for asset in meta.get('universe', [])}
+        self._meta_ts = time.time()
+
+    def get_market_data(self, symbol: str, max_age: float = META_TTL_SECONDS) -> Dict:
+        """Fetch market data (served from the cached universe index within max_age seconds)"""
         try:
-            meta = self.info.meta()
-            universe = meta.get('universe', [])
-            for asset in universe:
-                if asset.get('name') == symbol:
-                    return asset
-            return {}
+            if time.time() - self._meta_ts >= max_age:
+                self._refresh_meta()
+            return self._meta_index.get(symbol, {})
         except Exception as e:
             print(f"Failed to fetch market data: {e}")
             return {}
 
+    def get_mark_price(self, symbol: str) -> float:
+        """Fetch mark price, cached for MARK_PRICE_TTL_SECONDS"""
+        now = time.time()
+        cached = self._mark_cache.get(symbol)
+        if cached and now - cached[0] < MARK_PRICE_TTL_SECONDS:
+            return cached[1]
+
+        market_data = self.get_market_data(symbol, max_age=MARK_PRICE_TTL_SECONDS)
+        mark_px = float(market_data.get('markPx', 0))
+        self._mark_cache[symbol] = (now, mark_px)
+        return mark_px
+
     def get_orderbook(self, symbol: str) -> Dict:
         """Fetch order book"""
         try:
@@ -48,24 +147,12 @@ class HyperliquidClient:
             print(f"Failed to fetch order book: {e}")
             return {}
 
-    def get_candles(self, symbol: str, interval: str = "1m", limit: int = 100) -> List:
-        """Fetch candlestick data"""
+    def get_candles(self, symbol: str, interval: str = "1m", limit: int = 100) -> np.ndarray:
+        """Fetch candlestick data as an (N, 6) float64 array: timestamp, open, high, low, close, volume"""
         try:
-            # Calculate seconds based on interval
-            interval_seconds = {
-                '1m': 60,
-                '3m': 180,
-                '5m': 300,
-                '15m': 900,
-                '30m': 1800,
-                '1h': 3600,
-                '2h': 7200,
-                '4h': 14400,
-                '1d': 86400
-            }.get(interval, 60)
-
-            start_time = int((time.time() - limit * interval_seconds) * 1000)
-            end_time = int(time.time() * 1000)
+            # Single clock read for both ends of the window
+            end_time = time.time_ns() // 1_000_000
+            start_time = end_time - _candle_window_ms(interval, limit)
 
             # Fetch candlestick data using SDK - parameter order: name, interval, startTime, endTime
             candles_data = self.info.candles_snapshot(
@@ -76,28 +163,40 @@ class HyperliquidClient:
             )
 
             # Convert to a unified format [timestamp, open, high, low, close, volume]
-            candles = []
-            for candle in candles_data:
-                candles.append([
-                    candle['t'],  # timestamp
-                    float(candle['o']),  # open
-                    float(candle['h']),  # high
-                    float(candle['l']),  # low
-                    float(candle['c']),  # close
-                    float(candle.get('v', 0))   # volume
-                ])
+            candles = np.empty((len(candles_data), 6), dtype=np.float64)
+            for i, candle in enumerate(candles_data):
+                candles[i] = _candle_row(candle)
 
             return candles
         except Exception as e:
             print(f"Failed to fetch candlestick data: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+            logger.debug("get_candles failed", exc_info=True)
+            return np.empty((0, 6), dtype=np.float64)
+
+    def subscribe_candles(self, symbol: str, interval: str, callback: Callable[[str, np.ndarray], None]) -> int:
+        """
+        Stream candle updates over the SDK websocket.
 
-    def get_user_state(self) -> Dict:
-        """Fetch user account information"""
+        callback(symbol, row) runs on the websocket thread with a (6,) float64 row in
+        get_candles() column order; the in-progress candle is pushed on every change.
+        """
+        def on_message(msg: Dict):
+            candle = msg.get('data')
+            if not candle:
+                return
+            callback(symbol, np.array(_candle_row(candle), dtype=np.float64))
+
+        return self.info.subscribe({"type": "candle", "coin": symbol, "interval": interval}, on_message)
+
+    def get_user_state(self, force: bool = False) -> Dict:
+        """Fetch user account information (reused for USER_STATE_TTL_SECONDS unless force=True)"""
         try:
-            return self.info.user_state(self.wallet_address)
+            now = time.time()
+            if not force and self._state_cache is not None and now - self._state_ts < USER_STATE_TTL_SECONDS:
+                return self._state_cache
+            self._state_cache = self.info.user_state(self.wallet_address)
+            self._state_ts = now
+            return self._state_cache
         except Exception as e:
             print(f"Failed to fetch account information: {e}")
             return {}
@@ -111,10 +210,10 @@ class HyperliquidClient:
             print(f"Failed to fetch open orders: {e}")
             return []
 
-    def get_positions(self) -> List:
-        """Fetch current positions"""
+    def get_positions(self, force: bool = False) -> List:
+        """Fetch current positions (force=True bypasses the user_state() cache)"""
         try:
-            state = self.get_user_state()
+            state = self.get_user_state(force=force)
             return state.get('assetPositions', [])
         except Exception as e:
             print(f"Failed to fetch positions: {e}")
@@ -124,23 +223,19 @@ class HyperliquidClient:
                    order_type: str = "limit", reduce_only: bool = False) -> Dict:
         """Place an order - Using the official SDK"""
         try:
-            from hyperliquid.utils.signing import OrderType
-
             # Fetch asset precision
             asset = self.get_market_data(symbol)
             sz_decimals = asset.get('szDecimals', 0)
 
             # Round to correct precision (DOGE is 0, i.e., integer)
             # Note: Round up to ensure minimum order value is met
-            import math
-            if sz_decimals == 0:
-                size = math.ceil(size)  # Round up
-            else:
-                size = round(size, sz_decimals)
+            size = math.ceil(size) if sz_decimals == 0 else round(size, sz_decimals)
 
             # Minimum trade size check
-            if size < (10 ** -sz_decimals):
-                print(f"Trade size too small: {size}, minimum: {10 ** -sz_decimals}")
+            min_size = (_MIN_SIZE_BY_DECIMALS[sz_decimals] if sz_decimals < len(_MIN_SIZE_BY_DECIMALS)
+                        else 10 ** -sz_decimals)
+            if size < min_size:
+                print(f"Trade size too small: {size}, minimum: {min_size}")
                 return {"error": "size_too_small"}
 
             # Determine order type
@@ -150,11 +245,11 @@ class HyperliquidClient:
             else:
                 ot = {"market": {}}
                 # Market orders require a price far from the market
-                market_data = self.get_market_data(symbol)
+                mark_px = self.get_mark_price(symbol)
                 if is_buy:
-                    limit_px = float(market_data.get('markPx', 0)) * 1.05  # Buy price +5%
+                    limit_px = mark_px * 1.05  # Buy price +5%
                 else:
-                    limit_px = float(market_data.get('markPx', 0)) * 0.95  # Sell price -5%
+                    limit_px = mark_px * 0.95  # Sell price -5%
 
             print(f"Order parameters: symbol={symbol}, is_buy={is_buy}, size={size}, limit_px={limit_px}, order_type={ot}")
 
@@ -168,14 +263,22 @@ class HyperliquidClient:
                 reduce_only=reduce_only
             )
 
+            # Account state changed; next query must hit the API
+            self._state_cache = None
+
             return result
 
         except Exception as e:
             print(f"Failed to place order: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.debug("place_order failed", exc_info=True)
             raise
 
+    def market_close(self, symbol: str, size: Optional[float] = None) -> Dict:
+        """Close a position at market through the client's long-lived Exchange session"""
+        result = self.exchange.market_close(symbol, sz=size)
+        self._state_cache = None
+        return result
+
     def cancel_order(self, order_id: int, symbol: str) -> Dict:
         """Cancel an order"""
         try:
@@ -190,14 +293,12 @@ class HyperliquidClient:
             if symbol:
                 return self.exchange.cancel_all(name=symbol)
             else:
-                # Cancel orders for all assets
-                result = {}
-                positions = self.get_open_orders()
-                for pos in positions:
-                    coin = pos.get('position', {}).get('coin')
-                    if coin:
-                        result[coin] = self.exchange.cancel_all(name=coin)
-                return result
+                # One signed bulk cancel for every resting order: a single nonce and request
+                # instead of one signature per coin
+                orders = self.info.open_orders(self.wallet_address)
+                if not orders:
+                    return {}
+                return self.exchange.bulk_cancel([{"coin": o["coin"], "oid": o["oid"]} for o in orders])
         except Exception as e:
             print(f"Failed to cancel all orders: {e}")
             return {}
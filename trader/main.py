@@ -2,43 +2,134 @@
 Improved Trading Bot - Enhanced Risk Management
 """
 import argparse
-import json
+import asyncio
+import atexit
+import functools
 import logging
+import math
 import os
+import queue
 import secrets
 import shutil
 import time
+from collections import deque
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
+# The bot persists compiled numba kernels next to this module so restarts load them from
+# disk; must be set before numba is first imported. An existing NUMBA_CACHE_DIR wins.
+os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.numba_cache'))
+
+import numpy as np
+import orjson
 import pandas as pd
 import requests
 
 from exchanges.factory import get_exchange_client
+from risk import (
+    evaluate_risk,
+    warmup as warmup_risk,
+    SIGNAL_CODES,
+    REASON_DYNAMIC_STOP_LOSS,
+    REASON_FIXED_STOP_LOSS,
+    REASON_DYNAMIC_TAKE_PROFIT,
+    REASON_FIXED_TAKE_PROFIT,
+    REASON_TRAILING_STOP,
+    REASON_TIME_STOP,
+    REASON_REVERSE_SELL,
+    REASON_REVERSE_BUY,
+)
 from strategies.strategies import get_strategy
 from telegram_notifier import get_notifier
 from nostr.signal_service import SignalBroadcaster
 from nostr.copytrade_listener import CopyTradeListener
 from pynostr.key import PrivateKey, PublicKey
 
+# Log calls only enqueue the record; a background listener thread does the file/console I/O
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(
+    _log_queue,
+    logging.FileHandler('trading_bot.log'),
+    logging.StreamHandler(),
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('trading_bot.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+_NS_PER_HOUR = 3_600_000_000_000
+
+# Confirmation poll after closing a position before reversing it
+CLOSE_CONFIRM_TIMEOUT_SECONDS = 1.0
+CLOSE_CONFIRM_POLL_SECONDS = 0.05
+
+# Trades kept in memory; the full session history is appended to an NDJSON file
+MAX_TRADE_HISTORY = 10000
+# Timestamps are naive local times (datetime.now()) and are written as such, without a UTC offset
+_HISTORY_DUMP_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+
+# Close-reason templates keyed by risk.evaluate_risk reason code; only the one that fires is formatted
+_CLOSE_REASON_FORMATS = {
+    REASON_DYNAMIC_STOP_LOSS: "Dynamic stop-loss (ATR: {stop_loss_atr:.4f})".format,
+    REASON_FIXED_STOP_LOSS: "Fixed stop-loss ({stop_loss:.1f}%)".format,
+    REASON_DYNAMIC_TAKE_PROFIT: "Dynamic stop-profit (ATR: {take_profit_atr:.4f})".format,
+    REASON_FIXED_TAKE_PROFIT: "Fixed stop-profit ({take_profit:.1f}%)".format,
+    REASON_TRAILING_STOP: "Trailing stop (protecting profit {max_pnl:.1f}% → {pnl:.1f}%)".format,
+    REASON_TIME_STOP: "Time stop-loss (holding {holding_hours:.1f}h)".format,
+    REASON_REVERSE_SELL: "Reverse signal stop-loss (SELL signal strength {strength:.0f}%)".format,
+    REASON_REVERSE_BUY: "Reverse signal stop-loss (BUY signal strength {strength:.0f}%)".format,
+}
+
+
+def _write_config(path: Path, config: Dict) -> None:
+    """Write config as indented JSON with a trailing newline (key order preserved)"""
+    path.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+
+
+def _candles_to_frame(candles: np.ndarray) -> pd.DataFrame:
+    """Wrap an (N, 6) candle array from the exchange client as the DataFrame strategies expect"""
+    df = pd.DataFrame(candles[:, 1:], columns=['open', 'high', 'low', 'close', 'volume'])
+    df.insert(0, 'timestamp', pd.to_datetime(candles[:, 0].astype(np.int64), unit='ms'))
+    return df
+
+
+def _merge_candle(buf: np.ndarray, row: np.ndarray, limit: int) -> np.ndarray:
+    """Apply a streamed candle to a rolling buffer of at most `limit` rows"""
+    if len(buf):
+        last_ts = buf[-1, 0]
+        if row[0] == last_ts:
+            # Update to the in-progress candle
+            buf[-1] = row
+            return buf
+        if row[0] < last_ts:
+            return buf
+    if len(buf) < limit:
+        return np.vstack((buf, row))
+    # Shift in place; the buffer keeps its allocation
+    buf[:-1] = buf[1:]
+    buf[-1] = row
+    return buf
+
+
+@functools.lru_cache(maxsize=4)
+def _private_key_from_nsec(nsec: str) -> PrivateKey:
+    """Decode an nsec once; bech32 decoding and key derivation are not cheap"""
+    return PrivateKey.from_nsec(nsec)
+
 
 def _pubkey_to_hex(raw: Optional[str]) -> Optional[str]:
     if not raw:
         return None
     try:
         if raw.startswith('nsec'):
-            priv = PrivateKey.from_nsec(raw)
+            priv = _private_key_from_nsec(raw)
             return priv.public_key.hex()
         if raw.startswith('npub'):
             if hasattr(PublicKey, 'from_npub'):
@@ -65,15 +156,25 @@ class TradingBot:
         """Initialize the trading bot"""
         self.test_mode = test_mode
         self.config = self._load_config(config_path)
+        self._snapshot_config()
+
+        # Compile the risk kernel now rather than on the first live tick
+        warmup_risk()
 
         # Initialize exchange client (defaults to hyperliquid, extendable via config)
         self.client = get_exchange_client(self.config, test_mode=test_mode)
 
         # Position tracking (synchronized with API in real-time)
-        self.positions_tracker = {}  # {symbol: {'entry_price': float, 'size': float, 'side': str, 'entry_time': float}}
+        self.positions_tracker = {}  # {symbol: {'entry_price': float, 'size': float, 'side': str, 'entry_time_ns': int (monotonic)}}
 
-        # Trade history
-        self.trade_history = []
+        # Recent trades in memory (bounded); every record is also appended to history_file
+        self.trade_history = deque(maxlen=self.config.get('trading', {}).get('max_history', MAX_TRADE_HISTORY))
+        self.history_file = Path(f"trade_history_{datetime.now().strftime('%Y%m%d_%H%M')}.ndjson")
+        # Running session totals, so statistics don't depend on the bounded history
+        self._total_trades = 0
+        self._closed_trades = 0
+        self._winning_trades = 0
+        self._total_pnl = 0.0
 
         # Strategy
         if not strategy_name:
@@ -90,6 +191,9 @@ class TradingBot:
         self.copytrade_cfg = self.config.get('copytrade', {})
         self.copytrade_role = (self.copytrade_cfg.get('role') or 'leader').lower()
         self.copytrade_listener = None
+        # Allowlists checked for every incoming copy-trade signal
+        self._copytrade_leaders = frozenset(self.copytrade_cfg.get('follow_pubkeys') or ())
+        self._copytrade_symbols = frozenset(self.copytrade_cfg.get('symbols') or ())
         if self.copytrade_cfg.get('enabled') and self.copytrade_role == 'follower':
             nostr_cfg = self.config.get('nostr', {})
             shared_key = _pubkey_to_hex(nostr_cfg.get('relayer_nostr_pubkey'))
@@ -104,7 +208,8 @@ class TradingBot:
                     allowed_pubkeys=follow_pubkeys,
                     on_signal=self._process_copytrade_signal,
                 )
-                self.copytrade_listener.start()
+                # Consumed on run()'s asyncio loop instead of a dedicated thread
+                self.copytrade_listener.start(threaded=False)
             else:
                 logger.warning("Copy-trade enabled for follower mode but relayer_nostr_pubkey/nsec/relays missing or invalid; listener not started")
 
@@ -113,8 +218,7 @@ class TradingBot:
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration file"""
         path = Path(config_path)
-        with path.open('r') as f:
-            config = json.load(f)
+        config = orjson.loads(path.read_bytes())
 
         # Resolve secrets that may be provided via environment variables (e.g., "$PRIVATE_KEY")
         def resolve_env_or_literal(value: Optional[str], field: str) -> Optional[str]:
@@ -154,10 +258,9 @@ class TradingBot:
             updated = True
         else:
             try:
-                PrivateKey.from_nsec(nsec)
+                priv = _private_key_from_nsec(nsec)
                 # populate npub if absent
                 if not nostr_cfg.get('npub'):
-                    priv = PrivateKey.from_nsec(nsec)
                     nostr_cfg['npub'] = priv.public_key.bech32()
                     updated = True
             except Exception:
@@ -170,12 +273,26 @@ class TradingBot:
             updated = True
 
         if updated:
-            with path.open('w') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
-                f.write('\n')
+            _write_config(path, config)
 
         return config
 
+    def _snapshot_config(self):
+        """Bind hot-path config values to attributes (call again after reloading config)"""
+        trading_cfg = self.config.get('trading', {})
+        self._stop_loss_percent = trading_cfg.get('stop_loss_percent', 0.03)
+        self._take_profit_percent = trading_cfg.get('take_profit_percent', 0.05)
+        self._trailing_stop_percent = trading_cfg.get('trailing_stop_percent', 0.02)
+        self._max_holding_hours = trading_cfg.get('max_holding_hours', 24)
+
+        telegram_cfg = self.config.get('telegram', {})
+        self._notify_startup = telegram_cfg.get('notify_startup', True)
+        self._notify_signals = telegram_cfg.get('notify_signals', True)
+        self._notify_trades = telegram_cfg.get('notify_trades', True)
+        self._notify_closures = telegram_cfg.get('notify_closures', True)
+
+        self._wallet_address = self.config.get('wallet_address')
+
     def sync_positions(self, symbol: str):
         """Synchronize position status (from API)"""
         try:
@@ -192,10 +309,10 @@ class TradingBot:
                             'entry_price': entry_price,
                             'size': abs(size),
                             'side': 'long' if size > 0 else 'short',
-                            'entry_time': time.time()
+                            'entry_time_ns': time.monotonic_ns()
                         }
                         found = True
-                        logger.info(f"📊 Synchronized position: {symbol} | {size} | Entry: ${entry_price:.4f}")
+                        logger.info("📊 Synchronized position: %s | %s | Entry: $%.4f", symbol, size, entry_price)
                     break
 
             # If not found, clear the tracker
@@ -206,33 +323,30 @@ class TradingBot:
         except Exception as e:
             logger.error(f"Sync positions failed: {e}")
 
-    def get_market_data(self, symbol: str, interval: str = "1h", limit: int = 100) -> pd.DataFrame:
-        """Fetch market data and convert to DataFrame"""
-        try:
-            candles = self.client.get_candles(symbol, interval, limit)
-
-            if not candles:
-                logger.warning(f"No data fetched for {symbol}")
-                return pd.DataFrame()
-
-            df = pd.DataFrame(candles)
-            df.columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col])
-
-            return df
-        except Exception as e:
-            logger.error(f"Fetch market data failed: {e}")
-            return pd.DataFrame()
-
-    def check_risk_management(self, symbol: str, current_price: float, signal_data: Dict):
+    async def get_candles_batch(self, symbols: List[str], interval: str = "1h",
+                                limit: int = 100) -> Dict[str, np.ndarray]:
+        """Fetch raw (N, 6) candle arrays for several symbols concurrently"""
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.client.get_candles, symbol, interval, limit) for symbol in symbols),
+            return_exceptions=True,
+        )
+        batch = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"Fetch market data failed for {symbol}: {result}")
+                result = np.empty((0, 6), dtype=np.float64)
+            batch[symbol] = result
+        return batch
+
+    def check_risk_management(self, symbol: str, current_price: float, signal_data: Dict,
+                              now: Optional[datetime] = None):
         """
         Improved risk management:
         - Use dynamic ATR stop-loss
         - Trailing stop to protect profits
         - Time-based stop-loss (close positions held too long)
+
+        `now` is the tick's wall-clock time used for trade records (defaults to the current time).
         """
         if symbol not in self.positions_tracker:
             return
@@ -240,71 +354,41 @@ class TradingBot:
         position = self.positions_tracker[symbol]
         entry_price = position['entry_price']
         side = position['side']
-        entry_time = position['entry_time']
-
-        # Calculate profit/loss percentage
-        if side == 'long':
-            pnl_percent = (current_price - entry_price) / entry_price
-        else:
-            pnl_percent = (entry_price - current_price) / entry_price
 
         # Holding time (hours)
-        holding_hours = (time.time() - entry_time) / 3600
+        holding_hours = (time.monotonic_ns() - position['entry_time_ns']) / _NS_PER_HOUR
 
-        # === 1. Dynamic stop-loss/stop-profit (based on ATR)===
+        # Dynamic stop-loss/stop-profit (based on ATR); 0 falls back to fixed percentages
         dynamic_stops = signal_data.get('dynamic_stops', {})
-        stop_loss_atr = dynamic_stops.get('stop_loss_atr')
-        take_profit_atr = dynamic_stops.get('take_profit_atr')
-
-        close_reason = None
+        stop_loss_atr = dynamic_stops.get('stop_loss_atr') or 0.0
+        take_profit_atr = dynamic_stops.get('take_profit_atr') or 0.0
 
-        # Use ATR dynamic stop-loss
-        if stop_loss_atr:
-            stop_loss_percent = stop_loss_atr / current_price
-            if pnl_percent <= -stop_loss_percent:
-                close_reason = f"Dynamic stop-loss (ATR: {stop_loss_atr:.4f})"
-        else:
-            # Fall back to fixed stop-loss
-            stop_loss = self.config['trading'].get('stop_loss_percent', 0.03)
-            if pnl_percent <= -stop_loss:
-                close_reason = f"Fixed stop-loss ({stop_loss*100:.1f}%)"
-
-        # Use ATR dynamic stop-profit
-        if take_profit_atr:
-            take_profit_percent = take_profit_atr / current_price
-            if pnl_percent >= take_profit_percent:
-                close_reason = f"Dynamic stop-profit (ATR: {take_profit_atr:.4f})"
-        else:
-            # Fall back to fixed stop-profit
-            take_profit = self.config['trading'].get('take_profit_percent', 0.05)
-            if pnl_percent >= take_profit:
-                close_reason = f"Fixed stop-profit ({take_profit*100:.1f}%)"
-
-        # === 2. Trailing stop (protect profits)===
-        trailing_stop = self.config['trading'].get('trailing_stop_percent', 0.02)
-        if pnl_percent > 0.03:  # Profit over 3% triggers trailing stop
-            # If drawdown exceeds 2%, close to protect profits
-            max_pnl = position.get('max_pnl', pnl_percent)
-            position['max_pnl'] = max(max_pnl, pnl_percent)
-
-            if pnl_percent < max_pnl - trailing_stop:
-                close_reason = f"Trailing stop (protecting profit {max_pnl*100:.1f}% → {pnl_percent*100:.1f}%)"
-
-        # === 3. Time-based stop-loss (hold too long)===
-        max_holding_hours = self.config['trading'].get('max_holding_hours', 24)
-        if holding_hours > max_holding_hours:
-            if pnl_percent < -0.01:  # Still losing after 24h, force close
-                close_reason = f"Time stop-loss (holding {holding_hours:.1f}h)"
-
-        # === 4. Reverse signal stop-loss ===
-        # If the strategy gives a strong reverse signal, should also close
         current_signal = signal_data.get('signal', 'hold')
         signal_strength = signal_data.get('strength', 0)
 
-        if side == 'long' and current_signal == 'sell' and signal_strength > 0.6:
-            close_reason = f"Reverse signal stop-loss (SELL signal strength {signal_strength*100:.0f}%)"
-        elif side == 'short' and current_signal == 'buy' and signal_strength > 0.6:
-            close_reason = f"Reverse signal stop-loss (BUY signal strength {signal_strength*100:.0f}%)"
+        reason_code, pnl_percent, max_pnl, new_max_pnl = evaluate_risk(
+            side == 'long', float(entry_price), float(current_price), holding_hours,
+            float(position.get('max_pnl', math.nan)),
+            float(stop_loss_atr), float(take_profit_atr),
+            float(self._stop_loss_percent), float(self._take_profit_percent),
+            float(self._trailing_stop_percent), float(self._max_holding_hours),
+            SIGNAL_CODES.get(current_signal, 0), float(signal_strength),
+        )
+        if not math.isnan(new_max_pnl):
+            position['max_pnl'] = new_max_pnl
+
+        close_reason = None
+        if reason_code:
+            close_reason = _CLOSE_REASON_FORMATS[reason_code](
+                stop_loss_atr=stop_loss_atr,
+                stop_loss=self._stop_loss_percent * 100,
+                take_profit_atr=take_profit_atr,
+                take_profit=self._take_profit_percent * 100,
+                max_pnl=max_pnl * 100,
+                pnl=pnl_percent * 100,
+                holding_hours=holding_hours,
+                strength=signal_strength * 100,
+            )
 
         # Execute close
         if close_reason:
@@ -314,15 +398,16 @@ class TradingBot:
 
             if success:
                 # Send close notification
-                if self.notifier and self.config.get('telegram', {}).get('notify_closures', True):
+                if self.notifier and self._notify_closures:
                     pnl = position['size'] * (current_price - entry_price) if side == 'long' else position['size'] * (entry_price - current_price)
                     self.notifier.notify_position_closed(
-                        symbol, entry_price, current_price, pnl, pnl_percent, close_reason, self.test_mode
+                        symbol, entry_price, current_price, pnl, pnl_percent, close_reason, self.test_mode,
+                        ts=now.timestamp() if now else None
                     )
 
                 # Record to trade history
-                self.trade_history.append({
-                    'timestamp': datetime.now(),
+                self._record_trade({
+                    'timestamp': now or datetime.now(),
                     'symbol': symbol,
                     'type': 'close',
                     'side': side,
@@ -335,6 +420,23 @@ class TradingBot:
                     'holding_hours': holding_hours
                 })
 
+    def _record_trade(self, trade: Dict):
+        """Append a trade record, update session totals and persist it as one NDJSON line"""
+        self.trade_history.append(trade)
+        self._total_trades += 1
+        if trade.get('type') == 'close':
+            pnl = trade.get('pnl', 0)
+            self._closed_trades += 1
+            self._winning_trades += pnl > 0
+            self._total_pnl += pnl
+
+        # Written as it happens so a crash doesn't lose the session's trades
+        try:
+            with open(self.history_file, 'ab') as f:
+                f.write(orjson.dumps(trade, default=str, option=_HISTORY_DUMP_OPTIONS))
+        except OSError as e:
+            logger.error(f"Failed to write trade history: {e}")
+
     def close_position(self, symbol: str, reason: str = "") -> bool:
         """Close position"""
         if symbol not in self.positions_tracker:
@@ -349,11 +451,8 @@ class TradingBot:
             return True
 
         try:
-            # Use market_close to close
-            from hyperliquid.exchange import Exchange
-            exchange = Exchange(self.client.account)
-
-            close_result = exchange.market_close(symbol, sz=position['size'])
+            # Use market_close to close (reuses the client's Exchange session)
+            close_result = self.client.market_close(symbol, size=position['size'])
             logger.info(f"✅ Closed position: {close_result}")
 
             # Clear position tracker
@@ -367,8 +466,20 @@ class TradingBot:
                 self.notifier.notify_error(f"Close failed ({symbol}): {str(e)}")
             return False
 
-    def execute_trade(self, symbol: str, signal: Dict) -> bool:
-        """Execute trade (improved version)"""
+    def _wait_for_position_cleared(self, symbol: str, timeout: float) -> bool:
+        """Poll the exchange until `symbol` has no open position; False on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            positions = self.client.get_positions(force=True)
+            if not any(p.get('position', {}).get('coin') == symbol and float(p['position'].get('szi', 0)) != 0
+                       for p in positions):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(CLOSE_CONFIRM_POLL_SECONDS)
+
+    def execute_trade(self, symbol: str, signal: Dict, now: Optional[datetime] = None) -> bool:
+        """Execute trade (improved version); `now` timestamps the trade record"""
         # First, sync position status
         self.sync_positions(symbol)
 
@@ -381,8 +492,8 @@ class TradingBot:
             return False
 
         # Send signal notification
-        if self.notifier and self.config.get('telegram', {}).get('notify_signals', True):
-            self.notifier.notify_trade_signal(symbol, signal, signal['price'])
+        if self.notifier and self._notify_signals:
+            self.notifier.notify_trade_signal(symbol, signal, signal['price'], ts=now.timestamp() if now else None)
 
         # Broadcast encrypted signal to Nostr (optional)
         if getattr(self, "signal_broadcaster", None) and self.signal_broadcaster.enabled:
@@ -391,7 +502,7 @@ class TradingBot:
                 signal=signal,
                 strategy=self.strategy.name,
                 test_mode=self.test_mode,
-                account=self.config.get('wallet_address'),
+                account=self._wallet_address,
             )
 
         try:
@@ -409,12 +520,14 @@ class TradingBot:
 
                 # If signal and position direction are opposite, close first
                 logger.info(f"Signal reversed, closing {current_side}")
-                self.close_position(symbol, reason=f"Reversed signal: {signal_type}")
-                time.sleep(1)  # Wait for close to complete
+                if self.close_position(symbol, reason=f"Reversed signal: {signal_type}") and not self.test_mode:
+                    # Wait for the exchange to reflect the close, returning as soon as it does
+                    if not self._wait_for_position_cleared(symbol, CLOSE_CONFIRM_TIMEOUT_SECONDS):
+                        logger.warning(f"Close of {symbol} not confirmed within {CLOSE_CONFIRM_TIMEOUT_SECONDS}s")
 
             # Get account balance
             balance = self.client.get_balance()
-            logger.info(f"Current balance: ${balance:.2f}")
+            logger.info("Current balance: $%.2f", balance)
 
             # Calculate trade amount
             position_value = signal['size'] * balance
@@ -425,7 +538,8 @@ class TradingBot:
 
             trade_size = position_value / signal['price']
 
-            logger.info(f"Calculating trade: Position=${position_value:.2f}, Price=${signal['price']:.4f}, Size={trade_size:.2f}")
+            logger.info("Calculating trade: Position=$%.2f, Price=$%.4f, Size=%.2f",
+                        position_value, signal['price'], trade_size)
 
             if self.test_mode:
                 logger.info(f"[Test mode] {signal_type.upper()} {symbol} | Size: {trade_size:.4f}")
@@ -435,7 +549,7 @@ class TradingBot:
                     'entry_price': signal['price'],
                     'size': trade_size,
                     'side': 'long' if signal_type == 'buy' else 'short',
-                    'entry_time': time.time()
+                    'entry_time_ns': time.monotonic_ns()
                 }
 
                 if getattr(self, "signal_broadcaster", None) and self.signal_broadcaster.enabled:
@@ -449,7 +563,7 @@ class TradingBot:
                         pnl=None,
                         pnl_percent=None,
                         test_mode=True,
-                        account=self.config.get('wallet_address'),
+                        account=self._wallet_address,
                     )
 
                 return True
@@ -471,13 +585,14 @@ class TradingBot:
                 'entry_price': signal['price'],
                 'size': trade_size,
                 'side': 'long' if is_buy else 'short',
-                'entry_time': time.time()
+                'entry_time_ns': time.monotonic_ns()
             }
 
             # Send trade notification
-            if self.notifier and self.config.get('telegram', {}).get('notify_trades', True):
+            if self.notifier and self._notify_trades:
                 self.notifier.notify_trade_executed(
-                    symbol, signal_type, trade_size, signal['price'], test_mode=False
+                    symbol, signal_type, trade_size, signal['price'], test_mode=False,
+                    ts=now.timestamp() if now else None
                 )
 
             if getattr(self, "signal_broadcaster", None) and self.signal_broadcaster.enabled:
@@ -498,13 +613,13 @@ class TradingBot:
                     pnl=None,
                     pnl_percent=None,
                     test_mode=False,
-                    account=self.config.get('wallet_address'),
+                    account=self._wallet_address,
                     note=f"oid={oid}" if oid else None,
                 )
 
             # Record trade
-            self.trade_history.append({
-                'timestamp': datetime.now(),
+            self._record_trade({
+                'timestamp': now or datetime.now(),
                 'symbol': symbol,
                 'type': signal_type,
                 'size': trade_size,
@@ -512,7 +627,7 @@ class TradingBot:
                 'order': order
             })
 
-            self.strategy.last_trade_time = time.time()
+            self.strategy.last_trade_time = time.monotonic()
             self.strategy.trade_count += 1
 
             return True
@@ -538,8 +653,7 @@ class TradingBot:
             price = float(payload.get('price', 0) or 0)
 
             leader_eth = payload.get('account') or payload.get('agent_eth_address') or payload.get('eth_address')
-            allowed_eth = self.copytrade_cfg.get('follow_pubkeys', [])
-            if allowed_eth and leader_eth not in allowed_eth:
+            if self._copytrade_leaders and leader_eth not in self._copytrade_leaders:
                 logger.debug("Copy-trade: leader %s not in allowlist", leader_eth)
                 return
 
@@ -547,8 +661,7 @@ class TradingBot:
                 logger.debug("Copy-trade: invalid payload %s", payload)
                 return
 
-            allowed_symbols = self.copytrade_cfg.get('symbols')
-            if allowed_symbols and symbol not in allowed_symbols:
+            if self._copytrade_symbols and symbol not in self._copytrade_symbols:
                 logger.debug("Copy-trade: symbol %s not allowed", symbol)
                 return
 
@@ -576,7 +689,7 @@ class TradingBot:
                 order_type='limit',
             )
 
-            self.trade_history.append({
+            self._record_trade({
                 'timestamp': datetime.now(),
                 'symbol': symbol,
                 'type': f'copy_{signal_type}',
@@ -586,7 +699,7 @@ class TradingBot:
                 'from_pubkey': sender_pubkey,
             })
 
-            if self.notifier and self.config.get('telegram', {}).get('notify_trades', True):
+            if self.notifier and self._notify_trades:
                 self.notifier.notify_trade_executed(
                     symbol, signal_type, trade_size, price, test_mode=self.test_mode
                 )
@@ -599,6 +712,8 @@ class TradingBot:
         trading_cfg = self.config.get('trading', {})
         resolved_interval = interval or int(trading_cfg.get('refresh_interval_seconds', 300))
         symbol = symbol or trading_cfg.get('default_symbol')
+        # Comma-separated symbols are traded side by side with one batched fetch per tick
+        symbols = [s.strip() for s in str(symbol).split(',') if s.strip()]
 
         logger.info(f"🚀 Starting trading bot | Symbol: {symbol} | Refresh interval: {resolved_interval} seconds")
 
@@ -606,8 +721,7 @@ class TradingBot:
         if self.copytrade_cfg.get('enabled') and self.copytrade_role == 'follower':
             logger.info("Copy-trade follower mode active: strategy loop disabled; awaiting Nostr signals (kind 30931)")
             try:
-                while True:
-                    time.sleep(resolved_interval)
+                asyncio.run(self._follower_loop(resolved_interval))
             except KeyboardInterrupt:
                 logger.info("Received stop signal, shutting down...")
                 self.shutdown()
@@ -619,7 +733,7 @@ class TradingBot:
             return
 
         # Send startup notification
-        if self.notifier and self.config.get('telegram', {}).get('notify_startup', True):
+        if self.notifier and self._notify_startup:
             self.notifier.notify_startup(
                 self.strategy.name, 
                 symbol, 
@@ -627,51 +741,13 @@ class TradingBot:
             )
 
         # Initialize: sync positions
-        self.sync_positions(symbol)
+        for sym in symbols:
+            self.sync_positions(sym)
 
         try:
-            while True:
-                # Fetch market data
-                df = self.get_market_data(symbol)
-
-                if df.empty:
-                    logger.warning("Unable to fetch market data")
-                    time.sleep(interval)
-                    continue
-
-                current_price = df['close'].iloc[-1]
-                logger.info(f"{symbol} Current price: ${current_price:.4f}")
-
-                # Strategy analysis
-                signal = self.strategy.analyze(df)
-
-                # Record strategy analysis
-                logger.info(f"Strategy analysis | Signal: {signal['signal'].upper()} | Strength: {signal['strength']:.2%}")
-
-                if 'indicators' in signal:
-                    ind = signal['indicators']
-                    logger.info(f"Technical indicators | RSI: {ind.get('rsi', 0):.2f} | "
-                              f"MACD: {ind.get('macd', 0):.4f} | "
-                              f"ADX: {ind.get('adx', 0):.2f}")
-
-                if 'conditions' in signal and signal['conditions']:
-                    for cond_type, conds in signal['conditions'].items():
-                        if conds:
-                            satisfied = sum(conds.values())
-                            total = len(conds)
-                            logger.info(f"{cond_type.upper()} Conditions: {satisfied}/{total} | {conds}")
-
-                # Risk management check (every loop)
-                self.check_risk_management(symbol, current_price, signal)
-
-                # Trade signal
-                if signal['signal'] != 'hold':
-                    logger.warning(f"⚠️ Trade signal triggered: {signal['signal'].upper()} | Strength: {signal['strength']:.2%}")
-                    self.execute_trade(symbol, signal)
-
-                # Wait for next loop
-                time.sleep(resolved_interval)
-
+            asyncio.run(self._trading_loop(
+                symbols, resolved_interval, candle_interval=trading_cfg.get('candle_interval', '1h')
+            ))
         except KeyboardInterrupt:
             logger.info("Received stop signal, shutting down...")
             self.shutdown()
@@ -681,23 +757,149 @@ class TradingBot:
                 self.notifier.notify_error(f"Bot runtime exception: {str(e)}")
             self.shutdown()
 
+    async def _follower_loop(self, interval: int):
+        """Consume copy-trade signals on this loop; idle if the listener is not running"""
+        if self.copytrade_listener is not None:
+            await self.copytrade_listener.run_async()
+        while True:
+            await asyncio.sleep(interval)
+
+    async def _trading_loop(self, symbols: List[str], interval: int,
+                            candle_interval: str = "1h", limit: int = 100):
+        """
+        Strategy loop driven by websocket candle pushes.
+
+        Candles are seeded over REST, then each push updates the symbol's rolling buffer
+        and triggers analysis and risk checks. Trades are only acted on when the signal
+        changes, a candle closes, or `interval` seconds have passed for that symbol, so
+        in-progress candle pushes don't repeat execute_trade. Any symbol that has had no
+        update for `interval` seconds (quiet market, dropped or unavailable stream) is
+        refreshed over REST on its own, so its risk checks keep running while other
+        symbols stream.
+        Blocking SDK calls run in worker threads so the event loop stays free.
+        """
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue = asyncio.Queue()
+
+        def on_candle(symbol: str, row: np.ndarray):
+            # Runs on the SDK websocket thread
+            loop.call_soon_threadsafe(updates.put_nowait, (symbol, row))
+
+        buffers = await self.get_candles_batch(symbols, candle_interval, limit)
+        # Monotonic time each symbol's buffer was last refreshed (push or REST)
+        last_update = dict.fromkeys(symbols, time.monotonic())
+        dirty = set(symbols)
+        # symbol -> (signal, candle open time, monotonic time) of the last signal traded on
+        last_trade: Dict[str, tuple] = {}
+
+        for symbol in symbols:
+            try:
+                await asyncio.to_thread(self.client.subscribe_candles, symbol, candle_interval, on_candle)
+            except Exception as e:
+                logger.warning(f"Candle stream unavailable for {symbol}, polling every {interval}s: {e}")
+
+        while True:
+            for symbol in symbols:
+                if symbol not in dirty:
+                    continue
+                candles = buffers.get(symbol)
+                if candles is None or len(candles) == 0:
+                    logger.warning(f"Unable to fetch market data for {symbol}")
+                    continue
+                await self._process_symbol(symbol, candles, last_trade, interval)
+            dirty = set()
+
+            # Wait for a push, but no longer than until the stalest symbol is due a REST refresh
+            timeout = max(min(last_update.values()) + interval - time.monotonic(), 0)
+            try:
+                symbol, row = await asyncio.wait_for(updates.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                # Coalesce everything that queued up while we were busy
+                while True:
+                    if symbol in buffers:
+                        buffers[symbol] = _merge_candle(buffers[symbol], row, limit)
+                        last_update[symbol] = time.monotonic()
+                        dirty.add(symbol)
+                    if updates.empty():
+                        break
+                    symbol, row = updates.get_nowait()
+
+            now = time.monotonic()
+            stale = [symbol for symbol in symbols if now - last_update[symbol] >= interval]
+            if stale:
+                fresh = await self.get_candles_batch(stale, candle_interval, limit)
+                now = time.monotonic()
+                for symbol, candles in fresh.items():
+                    # Retry after another interval either way; keep the old buffer if the fetch failed
+                    last_update[symbol] = now
+                    if len(candles):
+                        buffers[symbol] = candles
+                        dirty.add(symbol)
+
+    async def _process_symbol(self, symbol: str, candles: np.ndarray,
+                              last_trade: Dict[str, tuple], trade_interval: float):
+        """
+        Analyze one symbol's (N, 6) candle buffer, run risk checks, and trade on the signal
+        if it changed, a candle closed, or `trade_interval` seconds passed since the last
+        trade on this symbol; `last_trade` holds that per-symbol state
+        """
+        # One wall-clock read per tick; every record from this decision shares it
+        now = datetime.now()
+        # Close of the newest candle straight from the buffer (column 4)
+        current_price = float(candles[-1, 4])
+        logger.info("%s Current price: $%.4f", symbol, current_price)
+
+        # Strategy analysis; strategies exposing analyze_arrays skip the DataFrame entirely
+        analyze_arrays = getattr(self.strategy, 'analyze_arrays', None)
+        if analyze_arrays is not None:
+            signal = analyze_arrays(candles[:, 0].astype(np.int64), candles[:, 1:])
+        else:
+            signal = self.strategy.analyze(_candles_to_frame(candles))
+
+        # Record strategy analysis (skipped entirely when INFO is disabled)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Strategy analysis | Signal: {signal['signal'].upper()} | Strength: {signal['strength']:.2%}")
+
+            if 'indicators' in signal:
+                ind = signal['indicators']
+                logger.info("Technical indicators | RSI: %.2f | MACD: %.4f | ADX: %.2f",
+                            ind.get('rsi', 0), ind.get('macd', 0), ind.get('adx', 0))
+
+            if 'conditions' in signal and signal['conditions']:
+                for cond_type, conds in signal['conditions'].items():
+                    if conds:
+                        satisfied = sum(conds.values())
+                        total = len(conds)
+                        logger.info(f"{cond_type.upper()} Conditions: {satisfied}/{total} | {conds}")
+
+        # Risk management check (every loop)
+        await asyncio.to_thread(self.check_risk_management, symbol, current_price, signal, now)
+
+        # Trade signal
+        if signal['signal'] != 'hold':
+            candle_ts = candles[-1, 0]
+            mono = time.monotonic()
+            last = last_trade.get(symbol)
+            if (last is not None and last[0] == signal['signal'] and last[1] == candle_ts
+                    and mono - last[2] < trade_interval):
+                return
+            last_trade[symbol] = (signal['signal'], candle_ts, mono)
+            logger.warning(f"⚠️ Trade signal triggered: {signal['signal'].upper()} | Strength: {signal['strength']:.2%}")
+            await asyncio.to_thread(self.execute_trade, symbol, signal, now)
+
     def shutdown(self):
         """Shutdown safely"""
         logger.info("💾 Saving trade history...")
 
         # Calculate statistics
-        total_trades = len(self.trade_history)
-        closed_trades = [t for t in self.trade_history if t.get('type') == 'close']
-        winning_trades = sum(1 for t in closed_trades if t.get('pnl', 0) > 0)
-        total_pnl = sum(t.get('pnl', 0) for t in closed_trades)
-        win_rate = winning_trades / len(closed_trades) if closed_trades else 0
-
         stats = {
-            'total_trades': total_trades,
-            'closed_trades': len(closed_trades),
-            'winning_trades': winning_trades,
-            'total_pnl': total_pnl,
-            'win_rate': win_rate
+            'total_trades': self._total_trades,
+            'closed_trades': self._closed_trades,
+            'winning_trades': self._winning_trades,
+            'total_pnl': self._total_pnl,
+            'win_rate': self._winning_trades / self._closed_trades if self._closed_trades else 0
         }
 
         logger.info(f"📊 Trade statistics: {stats}")
@@ -705,13 +907,15 @@ class TradingBot:
         # Send shutdown notification
         if self.notifier:
             self.notifier.notify_shutdown(stats)
+            # Deliver it (and anything still queued) before the process exits
+            self.notifier.close()
 
-        # Save trade history
-        history_file = f"trade_history_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-        with open(history_file, 'w') as f:
-            json.dump(self.trade_history, f, indent=2, default=str)
+        # Post any trade-tx reports still queued for the relayer
+        self.signal_broadcaster.close()
 
-        logger.info(f"✅ Trade history saved to {history_file}")
+        # Trade history is appended to disk as trades happen
+        if self._total_trades:
+            logger.info(f"✅ Trade history saved to {self.history_file}")
         logger.info("👋 Bot safely shutdown")
 
 
@@ -733,8 +937,7 @@ def run_init(config_path: Path) -> None:
             print("config.example.json not found; cannot bootstrap config")
             return
 
-    with config_path.open('r') as f:
-        config = json.load(f)
+    config = orjson.loads(config_path.read_bytes())
 
     def prompt(msg: str, default: Optional[str] = None, allow_empty: bool = False) -> str:
         suffix = f" [{default}]" if default is not None else ""
@@ -893,9 +1096,7 @@ def run_init(config_path: Path) -> None:
     nostr_cfg = config.setdefault('nostr', {})
 
     # Save config after prompts
-    with config_path.open('w') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
-        f.write('\n')
+    _write_config(config_path, config)
     print(f"Config saved to {config_path}.")
 
     # Bot registration
@@ -918,9 +1119,7 @@ def run_init(config_path: Path) -> None:
             platform_pubkey = data.get('platform_pubkey')
             if platform_pubkey:
                 nostr_cfg['relayer_nostr_pubkey'] = platform_pubkey
-                with config_path.open('w') as f:
-                    json.dump(config, f, indent=2, ensure_ascii=False)
-                    f.write('\n')
+                _write_config(config_path, config)
                 print("Saved platform_pubkey into nostr.relayer_nostr_pubkey")
 
                 # Emit plaintext agent register event over nostr
@@ -975,21 +1174,27 @@ def main():
     parser.add_argument('--config', type=str, default='config.json', help='Config file path')
     parser.add_argument('--test', action='store_true', help='Test mode')
     parser.add_argument('--strategy', type=str, help='Strategy name')
-    parser.add_argument('--symbol', type=str, help='Trading pair')
+    parser.add_argument('--symbol', type=str, help='Trading pair (comma-separate several symbols)')
     parser.add_argument('--interval', type=int, default=None, help='Refresh interval override in seconds (otherwise from config)')
     parser.add_argument('--init', action='store_true', help='Initialize config interactively (no trading)')
 
     args = parser.parse_args()
 
+    try:
+        import uvloop  # type: ignore
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     if args.init:
         run_init(Path(args.config))
         return
 
     strategy_name = args.strategy
     if not strategy_name:
-        with open(args.config) as f:
-            config = json.load(f)
-            strategy_name = config['trading'].get('default_strategy', 'test')
+        config = orjson.loads(Path(args.config).read_bytes())
+        strategy_name = config['trading'].get('default_strategy', 'test')
 
     bot = TradingBot(config_path=args.config, test_mode=args.test, strategy_name=strategy_name)
     bot.run(symbol=args.symbol, interval=args.interval)
@@ -0,0 +1,42 @@
+"""
+JSON helpers for Nostr payloads.
+
+Uses orjson when it is installed and falls back to the stdlib otherwise.
+Both accept payload dataclasses directly, so callers need no asdict() copy.
+`dumps` returns compact `str` output; `dumps_bytes` returns UTF-8 bytes for
+callers that feed the result straight into a cipher.
+"""
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    import dataclasses
+    import json
+
+    loads = json.loads
+
+    def _default(obj):
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+    def dumps_bytes(obj) -> bytes:
+        return dumps(obj).encode("utf-8")
+
+else:
+    # Indicator values often arrive as numpy scalars from pandas/ta
+    _DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    loads = orjson.loads
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS).decode()
+
+    def dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+
+
+__all__ = ["dumps", "dumps_bytes", "loads"]
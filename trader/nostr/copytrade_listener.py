@@ -3,14 +3,16 @@ Copy-trade listener that subscribes to Nostr trade signals and forwards
 accepted signals to a callback after decrypting.
 """
 
-import json
+import asyncio
 import threading
 import logging
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from nostr import init_global_publisher, get_publisher
+from nostr import _json
+from nostr.crypto import Nip04Crypto, Nip44Crypto
 from nostr.events import TRADE_SIGNAL_KIND
-from pynostr.encrypted_dm import EncryptedDirectMessage
+from nostr.publisher import EVENT_CHANNEL_WAKEUP
 from pynostr.key import PrivateKey, PublicKey
 
 logger = logging.getLogger(__name__)
@@ -30,68 +32,109 @@ class CopyTradeListener:
         self._nsec = nsec
         self._relays = relays or []
         self._shared_key_hex = shared_key_hex
-        self._allowed_pubkeys = set(allowed_pubkeys or [])
-        self._listen_kinds = listen_kinds or [TRADE_SIGNAL_KIND]
+        self._allowed_pubkeys = frozenset(allowed_pubkeys or [])
+        self._listen_kinds = list(listen_kinds or [TRADE_SIGNAL_KIND])
+        # Per-event membership check
+        self._kind_filter = frozenset(self._listen_kinds)
         self._on_signal = on_signal
         self._thread: Optional[threading.Thread] = None
+        self._pub = None
         self._stop = threading.Event()
+        # Shared secret (NIP-04) and conversation key (NIP-44) with the relayer key, derived once in start()
+        self._shared_secret_hex: Optional[str] = None
+        self._conversation_key_hex: Optional[str] = None
 
-    def start(self) -> None:
+    def start(self, *, threaded: bool = True) -> None:
+        """Initialize the publisher; with threaded=False, drive the listener via `run_async()`."""
         if not self._nsec or not self._relays:
             logger.warning("CopyTradeListener disabled: missing nsec or relays")
             return
 
+        try:
+            receiver = PrivateKey.from_nsec(self._nsec)
+            sender_pk = PublicKey.from_hex(self._shared_key_hex)
+            self._shared_secret_hex = receiver.compute_shared_secret(sender_pk.hex()).hex()
+            self._conversation_key_hex = Nip44Crypto.get_conversation_key(self._shared_secret_hex)
+        except Exception as exc:
+            logger.warning("CopyTradeListener disabled: invalid nsec or shared key (%s)", exc)
+            return
+
         init_global_publisher(self._nsec, relays=self._relays, listen_kinds=self._listen_kinds)
         pub = get_publisher()
         if pub is None:
             logger.warning("CopyTradeListener failed to init publisher")
             return
 
-        self._thread = threading.Thread(target=self._loop, args=(pub,), name="copytrade-listener", daemon=True)
-        self._thread.start()
+        self._pub = pub
+        if threaded:
+            self._thread = threading.Thread(target=self._loop, args=(pub,), name="copytrade-listener", daemon=True)
+            self._thread.start()
         logger.info("CopyTradeListener started (kinds=%s relays=%d)", self._listen_kinds, len(self._relays))
 
     def stop(self) -> None:
         self._stop.set()
         if self._thread:
+            # _loop blocks on the channel without a timeout; wake it so it sees the stop flag
+            self._pub.wake_event_channel()
             self._thread.join(timeout=1.5)
 
+    async def run_async(self) -> None:
+        """Consume events on the caller's asyncio loop; callbacks run in worker threads."""
+        if self._pub is None:
+            return
+        async for ev in self._pub.events():
+            if self._stop.is_set():
+                break
+            accepted = self._decode(ev)
+            if accepted is not None:
+                await asyncio.to_thread(self._dispatch, *accepted)
+
     def _loop(self, pub) -> None:
         chan = pub.get_event_channel()
-        while not self._stop.is_set():
-            try:
-                ev = chan.get(timeout=1.0)
-            except Exception:
+        while True:
+            ev = chan.get()
+            if self._stop.is_set():
+                break
+            if ev is EVENT_CHANNEL_WAKEUP:
                 continue
 
-            if ev.kind not in self._listen_kinds:
-                continue
+            accepted = self._decode(ev)
+            if accepted is not None:
+                self._dispatch(*accepted)
 
-            sender = getattr(ev, "pubkey", "")
+    def _decode(self, ev) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Decrypt an event into (payload, sender) or None if it should be ignored."""
+        if ev.kind not in self._kind_filter:
+            return None
 
-            try:
-                receiver = PrivateKey.from_nsec(self._nsec)
-                sender_pk = PublicKey.from_hex(self._shared_key_hex)
-                dm = EncryptedDirectMessage(
-                    receiver.public_key.hex(),
-                    sender_pk.hex(),
-                    encrypted_message=ev.content,
-                )
-                dm.decrypt(receiver.hex())
-                payload = json.loads(dm.cleartext_content)
-            except Exception as exc:
-                logger.debug("Failed to decrypt signal via NIP-04 DM: %s", exc)
-                continue
+        sender = ev.pubkey
+
+        try:
+            payload = _json.loads(self._decrypt(ev.content))
+        except Exception as exc:
+            # Most relay events are rejects; skip the debug call entirely when DEBUG is off
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Failed to decrypt signal (NIP-04/NIP-44): %s", exc)
+            return None
 
-            if not isinstance(payload, dict):
+        if not isinstance(payload, dict):
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug("Ignoring non-dict payload")
-                continue
+            return None
+
+        return payload, sender
 
-            if self._on_signal:
-                try:
-                    self._on_signal(payload, sender)
-                except Exception as exc:
-                    logger.warning("Copy-trade callback error: %s", exc)
+    def _decrypt(self, content: str) -> str:
+        if Nip44Crypto.is_payload(content):
+            return Nip44Crypto.decrypt(content, self._conversation_key_hex)
+        return Nip04Crypto.decrypt(content, self._shared_secret_hex)
+
+    def _dispatch(self, payload: Dict[str, Any], sender: str) -> None:
+        if self._on_signal:
+            try:
+                self._on_signal(payload, sender)
+            except Exception as exc:
+                logger.warning("Copy-trade callback error: %s", exc)
 
 
 __all__ = ["CopyTradeListener"]
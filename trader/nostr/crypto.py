@@ -1,16 +1,27 @@
 import base64
+import functools
+import hashlib
+import hmac
 import json
 import os
+import struct
 from typing import Optional, Dict, Union
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.kdf.hkdf import HKDFExpand
 
 # ==========================================
 # NIP-04 (Kind 4) 
 # ==========================================
+@functools.lru_cache(maxsize=16)
+def _aes_key(shared_secret_hex: str) -> algorithms.AES:
+    """AES key object for a shared secret; a bot talks to one or two peers, so reuse it"""
+    return algorithms.AES(bytes.fromhex(shared_secret_hex))
+
+
 class Nip04Crypto:
     """
     handle Kind 4 messages (Invite / Kick)
@@ -19,14 +30,16 @@ class Nip04Crypto:
     """
     
     @staticmethod
-    def encrypt(content: str, shared_secret_hex: str) -> str:
-        key = bytes.fromhex(shared_secret_hex)
+    def encrypt(content: Union[str, bytes], shared_secret_hex: str) -> str:
         iv = os.urandom(16)
+        if isinstance(content, str):
+            content = content.encode('utf-8')
         
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(content.encode('utf-8')) + padder.finalize()
+        # PKCS7 padding to the 16-byte block size
+        pad = 16 - len(content) % 16
+        padded_data = content + bytes((pad,)) * pad
         
-        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+        cipher = Cipher(_aes_key(shared_secret_hex), modes.CBC(iv), backend=default_backend())
         encryptor = cipher.encryptor()
         ciphertext = encryptor.update(padded_data) + encryptor.finalize()
         
@@ -35,7 +48,6 @@ class Nip04Crypto:
     @staticmethod
     def decrypt(encrypted_content: str, shared_secret_hex: str) -> str:
         try:
-            key = bytes.fromhex(shared_secret_hex)
             if "?iv=" not in encrypted_content:
                 raise ValueError("NIP-04 format error: missing ?iv=")
             
@@ -43,7 +55,7 @@ class Nip04Crypto:
             ciphertext = base64.b64decode(payload_b64)
             iv = base64.b64decode(iv_b64)
             
-            cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+            cipher = Cipher(_aes_key(shared_secret_hex), modes.CBC(iv), backend=default_backend())
             decryptor = cipher.decryptor()
             padded_data = decryptor.update(ciphertext) + decryptor.finalize()
             
@@ -54,6 +66,95 @@ class Nip04Crypto:
             print(f"[Nip04] Decryption failed: {e}")
             raise e
 
+# ==========================================
+# NIP-44 v2
+# ==========================================
+@functools.lru_cache(maxsize=16)
+def _key_bytes(key_hex: str) -> bytes:
+    return bytes.fromhex(key_hex)
+
+
+class Nip44Crypto:
+    """
+    NIP-44 v2 payload encryption
+    algorithm: ChaCha20 + HMAC-SHA256, keys from HKDF over the ECDH x-coordinate
+    format: Base64( Version[1]=0x02 + Nonce[32] + Ciphertext + MAC[32] )
+    """
+
+    VERSION = 2
+    SALT = b"nip44-v2"
+
+    @staticmethod
+    def get_conversation_key(shared_secret_hex: str) -> str:
+        """HKDF-extract of the unhashed ECDH x-coordinate; derive once per peer and reuse"""
+        return hmac.new(Nip44Crypto.SALT, bytes.fromhex(shared_secret_hex), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _message_keys(conversation_key: bytes, nonce: bytes):
+        keys = HKDFExpand(algorithm=hashes.SHA256(), length=76, info=nonce).derive(conversation_key)
+        return keys[:32], keys[32:44], keys[44:]
+
+    @staticmethod
+    def _padded_len(unpadded_len: int) -> int:
+        if unpadded_len <= 32:
+            return 32
+        next_power = 1 << (unpadded_len - 1).bit_length()
+        chunk = 32 if next_power <= 256 else next_power // 8
+        return chunk * ((unpadded_len - 1) // chunk + 1)
+
+    @staticmethod
+    def _chacha20(key: bytes, nonce: bytes, data: bytes) -> bytes:
+        # cryptography takes a 16-byte nonce: 4-byte little-endian counter (0) + 12-byte nonce
+        cipher = Cipher(algorithms.ChaCha20(key, b"\x00" * 4 + nonce), mode=None, backend=default_backend())
+        return cipher.encryptor().update(data)
+
+    @staticmethod
+    def encrypt(content: Union[str, bytes], conversation_key_hex: str, nonce: Optional[bytes] = None) -> str:
+        plaintext = content.encode('utf-8') if isinstance(content, str) else content
+        if not 1 <= len(plaintext) <= 65535:
+            raise ValueError("NIP-44 plaintext must be 1..65535 bytes")
+
+        nonce = nonce or os.urandom(32)
+        chacha_key, chacha_nonce, hmac_key = Nip44Crypto._message_keys(_key_bytes(conversation_key_hex), nonce)
+
+        padded = (
+            struct.pack(">H", len(plaintext))
+            + plaintext
+            + b"\x00" * (Nip44Crypto._padded_len(len(plaintext)) - len(plaintext))
+        )
+        ciphertext = Nip44Crypto._chacha20(chacha_key, chacha_nonce, padded)
+        mac = hmac.new(hmac_key, nonce + ciphertext, hashlib.sha256).digest()
+
+        return base64.b64encode(bytes([Nip44Crypto.VERSION]) + nonce + ciphertext + mac).decode()
+
+    @staticmethod
+    def decrypt(payload: str, conversation_key_hex: str) -> str:
+        if not payload or payload[0] == "#":
+            raise ValueError("NIP-44 unknown encryption version")
+        data = base64.b64decode(payload)
+        if not 99 <= len(data) <= 65603:
+            raise ValueError("NIP-44 invalid payload size")
+        if data[0] != Nip44Crypto.VERSION:
+            raise ValueError(f"NIP-44 unknown encryption version {data[0]}")
+
+        nonce, ciphertext, mac = data[1:33], data[33:-32], data[-32:]
+        chacha_key, chacha_nonce, hmac_key = Nip44Crypto._message_keys(_key_bytes(conversation_key_hex), nonce)
+
+        expected = hmac.new(hmac_key, nonce + ciphertext, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, mac):
+            raise ValueError("NIP-44 invalid MAC")
+
+        padded = Nip44Crypto._chacha20(chacha_key, chacha_nonce, ciphertext)
+        unpadded_len = struct.unpack(">H", padded[:2])[0]
+        if unpadded_len == 0 or len(padded) != 2 + Nip44Crypto._padded_len(unpadded_len):
+            raise ValueError("NIP-44 invalid padding")
+        return padded[2:2 + unpadded_len].decode('utf-8')
+
+    @staticmethod
+    def is_payload(content: str) -> bool:
+        """NIP-04 content always carries '?iv='; anything else is treated as NIP-44"""
+        return "?iv=" not in content
+
 # ==========================================
 # Group Crypto (Kind 42 / 20000) encryption and decryption implementation
 # ==========================================
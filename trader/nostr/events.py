@@ -7,12 +7,14 @@ and predictable tags to keep parsing simple on the platform side.
 
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional
+import functools
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from pynostr.event import Event
 
+from nostr import _json
+
 
 # Kind reservations for trading bot events
 TRADE_SIGNAL_KIND = 30931
@@ -24,9 +26,28 @@ AGENT_REGISTER_KIND = 30935
 DEFAULT_VERSION = "v1"
 
 
-def _compact_json(data: Dict[str, Any]) -> str:
+def _compact_json(data: Any) -> str:
     """Serialize to compact JSON for nostr content."""
-    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return _json.dumps(data)
+
+
+# Tags are immutable (key, value) tuples shared across events; each event only
+# allocates its outer tag list (pynostr appends to it).
+Tag = Tuple[str, ...]
+
+_D_TAG: Tag = ("d", "subspace_op")
+_TEST_TAGS = {True: ("test", "1"), False: ("test", "0")}
+
+
+@functools.lru_cache(maxsize=64)
+def _tag(key: str, value: str) -> Tag:
+    return (key, value)
+
+
+@functools.lru_cache(maxsize=16)
+def _base_tags(sid: str, version: str) -> Tuple[Tag, ...]:
+    """Leading tags shared by every event of a broadcaster (its sid never changes)"""
+    return (_D_TAG, _tag("sid", sid), _tag("ver", version))
 
 
 class BotEvent(Event):
@@ -38,23 +59,17 @@ class BotEvent(Event):
         kind: int,
         content: str,
         sid: str,
-        tags: Optional[List[List[str]]] = None,
+        tags: Optional[Sequence[Sequence[str]]] = None,
         version: str = DEFAULT_VERSION,
     ) -> None:
-        base_tags: List[List[str]] = [
-            ["d", "subspace_op"],
-            ["sid", sid],
-            ["ver", version],
-        ]
-        if tags:
-            base_tags.extend(tags)
-        super().__init__(content=content, kind=kind, tags=base_tags)
+        all_tags: List[Sequence[str]] = [*_base_tags(sid, version), *tags] if tags else list(_base_tags(sid, version))
+        super().__init__(content=content, kind=kind, tags=all_tags)
 
 
 # === Payload helpers ===
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeSignalPayload:
     symbol: str
     signal: str
@@ -68,7 +83,7 @@ class TradeSignalPayload:
     note: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CopyTradeIntentPayload:
     follower_pubkey: str
     symbol: Optional[str] = None
@@ -77,7 +92,7 @@ class CopyTradeIntentPayload:
     note: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionReportPayload:
     symbol: str
     side: str
@@ -92,7 +107,7 @@ class ExecutionReportPayload:
     note: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentRegisterPayload:
     bot_pubkey: str
     nostr_pubkey: str
@@ -100,7 +115,7 @@ class AgentRegisterPayload:
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class HeartbeatPayload:
     status: str
     balance: Optional[float] = None
@@ -127,16 +142,22 @@ class TradeSignalEvent(BotEvent):
         signal: str,
         test_mode: bool = False,
     ) -> "TradeSignalEvent":
-        tags: List[List[str]] = [
-            ["op", cls.OP],
-            ["symbol", symbol],
-            ["strategy", strategy],
-            ["signal", signal],
-            ["test", "1" if test_mode else "0"],
-        ]
+        tags = _trade_signal_tags(symbol, strategy, signal, test_mode)
         return cls(kind=cls.KIND, content=encrypted_content, sid=sid, tags=tags)
 
 
+@functools.lru_cache(maxsize=256)
+def _trade_signal_tags(symbol: str, strategy: str, signal: str, test_mode: bool) -> Tuple[Tag, ...]:
+    """Tag tuple for a trade signal; repeated signals for a symbol reuse it"""
+    return (
+        _tag("op", TradeSignalEvent.OP),
+        _tag("symbol", symbol),
+        _tag("strategy", strategy),
+        _tag("signal", signal),
+        _TEST_TAGS[bool(test_mode)],
+    )
+
+
 class CopyTradeIntentEvent(BotEvent):
     """Follower declares subscription or updates copy-trade preferences."""
 
@@ -152,9 +173,9 @@ class CopyTradeIntentEvent(BotEvent):
         follower_pubkey: str,
         symbol: Optional[str] = None,
     ) -> "CopyTradeIntentEvent":
-        tags: List[List[str]] = [["op", cls.OP], ["p", follower_pubkey]]
+        tags: List[Tag] = [_tag("op", cls.OP), ("p", follower_pubkey)]
         if symbol:
-            tags.append(["symbol", symbol])
+            tags.append(_tag("symbol", symbol))
         return cls(kind=cls.KIND, content=encrypted_content, sid=sid, tags=tags)
 
 
@@ -175,16 +196,22 @@ class ExecutionReportEvent(BotEvent):
         status: str,
         test_mode: bool = False,
     ) -> "ExecutionReportEvent":
-        tags: List[List[str]] = [
-            ["op", cls.OP],
-            ["symbol", symbol],
-            ["side", side],
-            ["status", status],
-            ["test", "1" if test_mode else "0"],
-        ]
+        tags = _execution_report_tags(symbol, side, status, test_mode)
         return cls(kind=cls.KIND, content=encrypted_content, sid=sid, tags=tags)
 
 
+@functools.lru_cache(maxsize=256)
+def _execution_report_tags(symbol: str, side: str, status: str, test_mode: bool) -> Tuple[Tag, ...]:
+    """Tag tuple for an execution report; symbol/side/status combinations are few"""
+    return (
+        _tag("op", ExecutionReportEvent.OP),
+        _tag("symbol", symbol),
+        _tag("side", side),
+        _tag("status", status),
+        _TEST_TAGS[bool(test_mode)],
+    )
+
+
 class HeartbeatEvent(BotEvent):
     """Lightweight health ping so the platform knows the bot is alive."""
 
@@ -198,8 +225,8 @@ class HeartbeatEvent(BotEvent):
         sid: str,
         content: HeartbeatPayload,
     ) -> "HeartbeatEvent":
-        json_content = _compact_json(asdict(content))
-        tags: List[List[str]] = [["op", cls.OP], ["status", content.status]]
+        json_content = _compact_json(content)
+        tags = (_tag("op", cls.OP), _tag("status", content.status))
         return cls(kind=cls.KIND, content=json_content, sid=sid, tags=tags)
 
 
@@ -216,7 +243,7 @@ class AgentRegisterEvent(BotEvent):
         sid: str,
         content: AgentRegisterPayload,
     ) -> "AgentRegisterEvent":
-        json_content = _compact_json(asdict(content))
+        json_content = _compact_json(content)
         tags: List[List[str]] = [
             ["op", cls.OP],
             ["p", content.nostr_pubkey],
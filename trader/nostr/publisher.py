@@ -19,17 +19,22 @@ Usage pattern:
         ev = event_channel.get(timeout=5)
         print(ev)
 
+    # ...or from an asyncio loop
+    async for ev in pub.events():
+        print(ev)
+
 Publishing and listening are done on background threads to avoid blocking hot paths.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import queue
 import threading
 import time
 import uuid
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 
 from pynostr.event import Event
 from pynostr.filters import Filters, FiltersList
@@ -50,6 +55,14 @@ from nostr.events import (
 
 logger = get_logger("nostr.publisher")
 
+# Placed on the event channel by wake_event_channel() to unblock a consumer waiting in get()
+EVENT_CHANNEL_WAKEUP = object()
+
+# Most queued events sent per relay round-trip by the publisher thread
+PUBLISH_BATCH_SIZE = 32
+# Events waiting for the publisher thread; on overflow the oldest is dropped (fresh signals matter more)
+PUBLISH_QUEUE_SIZE = 1024
+
 
 class NostrPublisher:
     """Async Nostr event publisher and listener backed by `RelayManager` and worker threads.
@@ -98,10 +111,17 @@ class NostrPublisher:
                 logger.warning(f"Failed to add Nostr relay {r}: {exc}")
 
         # Outgoing event queue (for publishing)
-        self._publish_queue: queue.Queue[Event] = queue.Queue()
+        self._publish_queue: queue.Queue[Event] = queue.Queue(maxsize=PUBLISH_QUEUE_SIZE)
 
         # Incoming event channel (for external consumers)
         self._event_channel: queue.Queue[Event] = queue.Queue(maxsize=1000)
+        # Set once get_event_channel() is called; until then the channel is only fed when
+        # there are no async consumers, so an async-only setup doesn't fill it with stale events
+        self._sync_consumer = False
+
+        # Async consumers registered via events(): (loop, queue) pairs
+        self._async_subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._async_subscribers_lock = threading.Lock()
 
         # Subscription tracking
         self._subscriptions: dict = {}
@@ -159,18 +179,70 @@ class NostrPublisher:
 
     def get_event_channel(self) -> queue.Queue[Event]:
         """Return the event channel (queue) for external consumers to get nostr events."""
+        self._sync_consumer = True
         return self._event_channel
 
+    def wake_event_channel(self) -> None:
+        """Unblock a thread waiting on the event channel (it receives EVENT_CHANNEL_WAKEUP)."""
+        try:
+            self._event_channel.put_nowait(EVENT_CHANNEL_WAKEUP)
+        except queue.Full:
+            # The consumer has pending events and will wake on its own
+            pass
+
+    async def events(self) -> AsyncIterator[Event]:
+        """Yield received events on the caller's asyncio loop without blocking a thread."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=1000))
+        with self._async_subscribers_lock:
+            self._async_subscribers.append(subscriber)
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self._async_subscribers_lock:
+                self._async_subscribers.remove(subscriber)
+
+    @staticmethod
+    def _offer_async(async_queue: asyncio.Queue, ev: Event) -> None:
+        try:
+            async_queue.put_nowait(ev)
+        except asyncio.QueueFull:
+            logger.warning("Nostr async event queue full; dropping event")
+
+    def _dispatch_event(self, ev: Event) -> None:
+        """Hand a received event to the sync channel and any async consumers."""
+        with self._async_subscribers_lock:
+            subscribers = list(self._async_subscribers)
+        for loop, async_queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer_async, async_queue, ev)
+            except RuntimeError:
+                # Consumer loop already closed
+                pass
+
+        if subscribers and not self._sync_consumer:
+            return
+        try:
+            self._event_channel.put_nowait(ev)
+        except queue.Full:
+            logger.warning("Nostr event channel full; dropping event")
+
     # -------------------------------------------------------------------------
     # Publishing
     # -------------------------------------------------------------------------
 
     def publish_event(self, event: Event) -> None:
-        """Enqueue an event for async publishing."""
-        try:
-            self._publish_queue.put_nowait(event)
-        except queue.Full:
-            logger.warning("NostrPublisher queue full; dropping event")
+        """Enqueue an event for async publishing; when the queue is full the oldest event is dropped."""
+        while True:
+            try:
+                self._publish_queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._publish_queue.get_nowait()
+                    logger.warning("NostrPublisher queue full; dropping oldest event")
+                except queue.Empty:
+                    pass
 
     def _publisher_loop(self) -> None:
         """Background loop that signs and publishes events."""
@@ -184,6 +256,7 @@ class NostrPublisher:
                 except Exception as exc:
                     logger.warning(f"Failed to connect publisher relays: {exc}")
         
+        priv_hex = self._private_key.hex()
         while not self._stop.is_set():
             event = None
             try:
@@ -192,29 +265,40 @@ class NostrPublisher:
                 pass  
 
             if event is not None:
-                try:
-                    event.sign(self._private_key.hex())
-                    self._publish_relay_manager.publish_event(event)
-                    
-                    logger.info(
-                        "Published Nostr event kind=%s id=%s role=%s",
-                        getattr(event, "kind", None),
-                        getattr(event, "id", None),
-                        self._role,
-                    )
-                    
-                    # Call run_sync to send the event
+                # Events queued behind this one share its relay round-trip
+                batch = [event]
+                while len(batch) < PUBLISH_BATCH_SIZE:
+                    try:
+                        batch.append(self._publish_queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                published = 0
+                for ev in batch:
+                    try:
+                        ev.sign(priv_hex)
+                        self._publish_relay_manager.publish_event(ev)
+                        published += 1
+                        logger.info(
+                            "Published Nostr event kind=%s id=%s role=%s",
+                            getattr(ev, "kind", None),
+                            getattr(ev, "id", None),
+                            self._role,
+                        )
+                    except Exception as exc:
+                        logger.warning(f"Failed to publish Nostr event: {exc}")
+
+                if published:
+                    # Call run_sync once to send the whole batch
                     try:
                         self._publish_relay_manager.run_sync()
-                        # Give relay more time to process and forward the event
+                        # Give relay more time to process and forward the events
                         time.sleep(0.5)
                     except Exception as exc:
                         logger.debug("PublishRelayManager.run_sync failed: %s", exc)
-                    
+
                     # Drain OK notices
                     self._drain_message_pool()
-                except Exception as exc:
-                    logger.warning(f"Failed to publish Nostr event: {exc}")
             else:
                 # Longer sleep when idle to reduce CPU usage
                 time.sleep(0.5)
@@ -232,8 +316,11 @@ class NostrPublisher:
         policy = RelayPolicy()
         
 
+        # All listen kinds share one filter under one subscription id, so each relay
+        # receives a single REQ and streams the merged result over one websocket.
         current_time = int(time.time())
-        filters = FiltersList([Filters(kinds=self._listen_kinds, since=current_time)])
+        kinds = sorted(set(self._listen_kinds))
+        filters = FiltersList([Filters(kinds=kinds, since=current_time)])
         subscription_id = uuid.uuid1().hex
         
         for relay_url in self._relays:
@@ -273,11 +360,8 @@ class NostrPublisher:
                     
                     if ev is not None and ev.id not in self._seen_event_ids:
                         self._seen_event_ids.add(ev.id)
-                        try:
-                            self._event_channel.put_nowait(ev)
-                            logger.debug(f"Listener received event: kind={ev.kind}, id={ev.id[:16]}...")
-                        except queue.Full:
-                            logger.warning("Nostr event channel full; dropping event")
+                        self._dispatch_event(ev)
+                        logger.debug(f"Listener received event: kind={ev.kind}, id={ev.id[:16]}...")
                 
                 # Drain EOSE notices
                 while self._listen_message_pool.has_eose_notices():
@@ -443,6 +527,6 @@ def get_publisher() -> Optional[NostrPublisher]:
     return _GLOBAL_PUBLISHER
 
 
-__all__ = ["NostrPublisher", "init_global_publisher", "get_publisher"]
+__all__ = ["NostrPublisher", "init_global_publisher", "get_publisher", "EVENT_CHANNEL_WAKEUP"]
 
 
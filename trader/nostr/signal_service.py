@@ -3,19 +3,23 @@ Signal broadcasting helpers for the trading bot.
 
 Responsibilities:
 - Initialize the global Nostr publisher
-- Encrypt payloads using DM (pynostr EncryptedDirectMessage)
+- Encrypt payloads with NIP-04 or NIP-44 using keys derived once per relayer
 - Publish trade signals, copy-trade intents, and execution reports
 """
 
-import json
+import functools
 import logging
-from typing import Any, Dict, Optional
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
 
-from dataclasses import asdict
 import requests
-from pynostr.encrypted_dm import EncryptedDirectMessage
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pynostr.key import PrivateKey, PublicKey
 
+from nostr import _json
+from nostr.crypto import Nip04Crypto, Nip44Crypto
 from nostr.events import (
     TradeSignalEvent,
     CopyTradeIntentEvent,
@@ -30,6 +34,44 @@ from nostr.publisher import init_global_publisher, get_publisher
 
 logger = logging.getLogger(__name__)
 
+# Pending trade-tx reports held for the background poster before new ones are dropped
+TX_REPORT_QUEUE_SIZE = 1000
+# (connect, read) seconds; a dead relayer fails fast instead of holding the worker for the full budget
+TX_REPORT_TIMEOUT = (1.0, 4.0)
+
+
+def _nsec_to_hex(raw: str) -> str:
+    return PrivateKey.from_nsec(raw).public_key.hex()
+
+
+def _npub_to_hex(raw: str) -> Optional[str]:
+    if hasattr(PublicKey, "from_npub"):
+        return PublicKey.from_npub(raw).hex()  # type: ignore[attr-defined]
+    from pynostr import nip19
+
+    hrp, data = nip19.decode(raw)
+    if hrp == "npub" and isinstance(data, bytes):
+        return data.hex()
+    return None
+
+
+def _checked_hex(raw: str) -> str:
+    PublicKey.from_hex(raw)  # validate
+    return raw
+
+
+# Decoder by bech32 prefix; anything else is treated as a hex pubkey
+_PUBKEY_DECODERS = {"nsec": _nsec_to_hex, "npub": _npub_to_hex}
+
+
+@functools.lru_cache(maxsize=32)
+def _pubkey_hex(raw: str) -> Optional[str]:
+    """Hex pubkey for an nsec/npub/hex key, or None; cached so reloads skip secp256k1 parsing"""
+    try:
+        return _PUBKEY_DECODERS.get(raw[:4], _checked_hex)(raw)
+    except Exception:
+        return None
+
 
 class SignalBroadcaster:
     """Encrypt and publish trading signals to Nostr."""
@@ -37,6 +79,8 @@ class SignalBroadcaster:
     def __init__(self, config: Dict[str, Any]):
         nostr_cfg = config.get("nostr", {})
         self.nsec = nostr_cfg.get("nsec")
+        # Single broadcast gate: stays True only once the relayer key, DM secret and
+        # publisher are all in place, so send_* check it before building any payload
         self.enabled = bool(self.nsec)
         self.platform_key_raw = nostr_cfg.get("relayer_nostr_pubkey")
         self.sid = nostr_cfg.get("sid", "bot-main")
@@ -44,6 +88,26 @@ class SignalBroadcaster:
         self.relays = nostr_cfg.get("relays", [])
         self.relayer_api = config.get("relayer_api")
         self.settlement_token = nostr_cfg.get("settlement_token")
+        # "nip04" (default, what the relayer decrypts today) or "nip44"
+        self.encryption = (nostr_cfg.get("encryption") or "nip04").lower()
+
+        # Pooled session for relayer reports (one keep-alive connection per host)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.1))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # Reports are pre-encoded with _json, so the session carries the JSON content type
+        self._session.headers["Content-Type"] = "application/json"
+        if self.settlement_token:
+            self._session.headers["X-Settlement-Token"] = self.settlement_token
+        self._trade_record_url = (
+            f"{self.relayer_api.rstrip('/')}/api/trades/record" if self.relayer_api else None
+        )
+
+        # Trade-tx reports are posted by a background thread so fills never wait on the relayer
+        self._tx_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=TX_REPORT_QUEUE_SIZE)
+        self._tx_worker: Optional[threading.Thread] = None
+        self._tx_worker_lock = threading.Lock()
 
         if not self.enabled:
             logger.info("Nostr broadcasting disabled: missing nsec")
@@ -59,6 +123,17 @@ class SignalBroadcaster:
             self.enabled = False
             return
 
+        # Every payload goes to the same relayer key, so the NIP-04 ECDH secret is derived once
+        try:
+            priv = PrivateKey.from_nsec(self.nsec)
+            self._shared_secret_hex = priv.compute_shared_secret(self.recipient_pubkey_hex).hex()
+            self._conversation_key_hex = Nip44Crypto.get_conversation_key(self._shared_secret_hex)
+        except Exception as exc:
+            logger.warning("Nostr broadcasting disabled: cannot derive DM key (%s)", exc)
+            self.publisher = None
+            self.enabled = False
+            return
+
         init_global_publisher(
             nostr_cfg["nsec"],
             self.relays,
@@ -82,8 +157,7 @@ class SignalBroadcaster:
     # Helpers
     # ------------------------------------------------------------------
     def _publish(self, event) -> bool:
-        if not self.enabled or self.publisher is None:
-            return False
+        # Callers have checked self.enabled, which implies a publisher
         try:
             self.publisher.publish_event(event)
             return True
@@ -91,47 +165,31 @@ class SignalBroadcaster:
             logger.warning("Failed to publish Nostr event: %s", exc)
             return False
 
-    def _encrypt(self, payload: Dict[str, Any]) -> Optional[str]:
-        if not self.nsec or not self.recipient_pubkey_hex:
-            return None
+    def _encrypt(self, payload: Any) -> Optional[str]:
+        # Callers have checked self.enabled, which implies the DM keys are derived
         try:
-            dm = EncryptedDirectMessage()
-            dm.encrypt(
-                PrivateKey.from_nsec(self.nsec).hex(),
-                recipient_pubkey=self.recipient_pubkey_hex,
-                cleartext_content=json.dumps(payload),
-            )
-            dm_event = dm.to_event()
-            dm_event.sign(PrivateKey.from_nsec(self.nsec).hex())
-            return dm_event.content
+            # Only the ciphertext is published; no DM envelope is built or signed
+            # Serialized bytes go straight into the cipher without a str round-trip
+            cleartext = _json.dumps_bytes(payload)
+            if self.encryption == "nip44":
+                return Nip44Crypto.encrypt(cleartext, self._conversation_key_hex)
+            return Nip04Crypto.encrypt(cleartext, self._shared_secret_hex)
         except Exception as exc:
             logger.warning("Failed to encrypt payload via DM: %s", exc)
             return None
 
+    def _emit(self, payload: Any, build: Callable[..., Any], **tags: Any) -> bool:
+        """Encrypt a payload, wrap it with the event builder and publish it."""
+        encrypted = self._encrypt(payload)
+        if not encrypted:
+            return False
+        return self._publish(build(sid=self.sid, encrypted_content=encrypted, **tags))
+
     @staticmethod
     def _derive_recipient_pubkey(platform_key_raw: Optional[str]) -> Optional[str]:
         if not platform_key_raw:
             return None
-        try:
-            if platform_key_raw.startswith("nsec"):
-                priv = PrivateKey.from_nsec(platform_key_raw)
-                return priv.public_key.hex()
-            if platform_key_raw.startswith("npub"):
-                if hasattr(PublicKey, "from_npub"):
-                    return PublicKey.from_npub(platform_key_raw).hex()  # type: ignore[attr-defined]
-                try:
-                    from pynostr import nip19
-
-                    hrp, data = nip19.decode(platform_key_raw)
-                    if hrp == "npub" and isinstance(data, bytes):
-                        return data.hex()
-                except Exception:
-                    pass
-            # assume hex
-            PublicKey.from_hex(platform_key_raw)  # validate
-            return platform_key_raw
-        except Exception:
-            return None
+        return _pubkey_hex(platform_key_raw)
 
     # ------------------------------------------------------------------
     # Public APIs
@@ -160,19 +218,14 @@ class SignalBroadcaster:
             indicators=signal.get("indicators"),
             note=signal.get("note"),
         )
-        encrypted = self._encrypt(asdict(payload))
-        if not encrypted:
-            return False
-
-        event = TradeSignalEvent.build(
-            sid=self.sid,
-            encrypted_content=encrypted,
+        return self._emit(
+            payload,
+            TradeSignalEvent.build,
             symbol=symbol,
             strategy=strategy,
             signal=payload.signal,
             test_mode=test_mode,
         )
-        return self._publish(event)
 
     def send_copytrade_intent(
         self,
@@ -193,17 +246,7 @@ class SignalBroadcaster:
             size_pct=size_pct,
             note=note,
         )
-        encrypted = self._encrypt(asdict(payload))
-        if not encrypted:
-            return False
-
-        event = CopyTradeIntentEvent.build(
-            sid=self.sid,
-            encrypted_content=encrypted,
-            follower_pubkey=follower_pubkey,
-            symbol=symbol,
-        )
-        return self._publish(event)
+        return self._emit(payload, CopyTradeIntentEvent.build, follower_pubkey=follower_pubkey, symbol=symbol)
 
     def send_execution_report(
         self,
@@ -238,19 +281,14 @@ class SignalBroadcaster:
             account=account,
             note=note or oid,
         )
-        encrypted = self._encrypt(asdict(payload))
-        if not encrypted:
-            return False
-
-        event = ExecutionReportEvent.build(
-            sid=self.sid,
-            encrypted_content=encrypted,
+        published = self._emit(
+            payload,
+            ExecutionReportEvent.build,
             symbol=symbol,
             side=side,
             status=status,
             test_mode=test_mode,
         )
-        published = self._publish(event)
 
         if self.relayer_api and self.publisher is not None:
             self._report_trade_tx(
@@ -275,7 +313,7 @@ class SignalBroadcaster:
         eth_address: str,
         name: str,
     ) -> bool:
-        if not self.enabled or self.publisher is None:
+        if not self.enabled:
             return False
 
         payload = AgentRegisterPayload(
@@ -305,11 +343,6 @@ class SignalBroadcaster:
             logger.warning("Failed to report trade tx: missing account/wallet for bot_pubkey")
             return
         db_role = "leader" if role.lower() in ("bot", "leader") else "follower"
-        url = f"{self.relayer_api.rstrip('/')}/api/trades/record"
-        headers = {"Content-Type": "application/json"}
-        if self.settlement_token:
-            headers["X-Settlement-Token"] = self.settlement_token
-
         payload = {
             "bot_pubkey": account,
             "follower_pubkey": follower_pubkey,
@@ -322,14 +355,47 @@ class SignalBroadcaster:
             "oid": oid,
         }
 
+        self._ensure_tx_worker()
         try:
-            resp = requests.post(url, json=payload, headers=headers, timeout=5)
-            if resp.status_code >= 300:
-                logger.warning(
-                    "Failed to report trade tx (status=%s): %s", resp.status_code, resp.text
+            self._tx_queue.put_nowait(payload)
+        except queue.Full:
+            logger.warning("Trade tx report queue full; dropping report for %s", symbol)
+
+    def _ensure_tx_worker(self) -> None:
+        with self._tx_worker_lock:
+            if self._tx_worker is None:
+                self._tx_worker = threading.Thread(
+                    target=self._tx_report_loop, name="trade-tx-reporter", daemon=True
                 )
-        except Exception as exc:
-            logger.warning("Failed to report trade tx to relayer: %s", exc)
+                self._tx_worker.start()
+
+    def _tx_report_loop(self) -> None:
+        while True:
+            payload = self._tx_queue.get()
+            if payload is None:  # close() sentinel
+                return
+            try:
+                resp = self._session.post(
+                    self._trade_record_url, data=_json.dumps_bytes(payload), timeout=TX_REPORT_TIMEOUT
+                )
+                if resp.status_code >= 300:
+                    logger.warning(
+                        "Failed to report trade tx (status=%s): %s", resp.status_code, resp.text
+                    )
+            except Exception as exc:
+                logger.warning("Failed to report trade tx to relayer: %s", exc)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued trade-tx reports (up to `timeout` seconds) and release the HTTP session."""
+        with self._tx_worker_lock:
+            worker, self._tx_worker = self._tx_worker, None
+        if worker is not None:
+            try:
+                self._tx_queue.put(None, timeout=timeout)
+                worker.join(timeout)
+            except queue.Full:
+                logger.warning("Trade tx report queue still full at shutdown; pending reports dropped")
+        self._session.close()
 
 
 __all__ = ["SignalBroadcaster"]
@@ -0,0 +1,93 @@
+"""
+Numeric core of the bot's position risk checks.
+
+`evaluate_risk` is compiled with numba when it is installed and runs as
+plain Python otherwise; callers map the returned reason code to text.
+Call `warmup()` at startup so compilation doesn't land on the first live tick.
+"""
+import math
+
+from _jit import njit
+
+# Signal codes
+SIGNAL_HOLD = 0
+SIGNAL_BUY = 1
+SIGNAL_SELL = 2
+
+SIGNAL_CODES = {'hold': SIGNAL_HOLD, 'buy': SIGNAL_BUY, 'sell': SIGNAL_SELL}
+
+# Close reason codes (0 = keep position)
+REASON_NONE = 0
+REASON_DYNAMIC_STOP_LOSS = 1
+REASON_FIXED_STOP_LOSS = 2
+REASON_DYNAMIC_TAKE_PROFIT = 3
+REASON_FIXED_TAKE_PROFIT = 4
+REASON_TRAILING_STOP = 5
+REASON_TIME_STOP = 6
+REASON_REVERSE_SELL = 7
+REASON_REVERSE_BUY = 8
+
+
+@njit(cache=True)
+def evaluate_risk(is_long, entry_price, current_price, holding_hours, max_pnl,
+                  stop_loss_atr, take_profit_atr, fixed_stop_loss, fixed_take_profit,
+                  trailing_stop, max_holding_hours, signal_code, signal_strength):
+    """
+    Evaluate stop conditions for one position.
+
+    ATR values of 0 fall back to the fixed percentages; max_pnl is NaN when no
+    peak has been tracked yet. Later checks take precedence over earlier ones.
+
+    Returns:
+        (reason_code, pnl_percent, previous_max_pnl, new_max_pnl)
+    """
+    if is_long:
+        pnl_percent = (current_price - entry_price) / entry_price
+    else:
+        pnl_percent = (entry_price - current_price) / entry_price
+
+    reason = REASON_NONE
+
+    # 1. Dynamic (ATR) or fixed stop-loss / take-profit
+    if stop_loss_atr != 0.0:
+        if pnl_percent <= -(stop_loss_atr / current_price):
+            reason = REASON_DYNAMIC_STOP_LOSS
+    elif pnl_percent <= -fixed_stop_loss:
+        reason = REASON_FIXED_STOP_LOSS
+
+    if take_profit_atr != 0.0:
+        if pnl_percent >= take_profit_atr / current_price:
+            reason = REASON_DYNAMIC_TAKE_PROFIT
+    elif pnl_percent >= fixed_take_profit:
+        reason = REASON_FIXED_TAKE_PROFIT
+
+    # 2. Trailing stop once profit exceeds 3%
+    previous_max = max_pnl
+    new_max = max_pnl
+    if pnl_percent > 0.03:
+        if math.isnan(previous_max):
+            previous_max = pnl_percent
+        new_max = max(previous_max, pnl_percent)
+        if pnl_percent < previous_max - trailing_stop:
+            reason = REASON_TRAILING_STOP
+
+    # 3. Time-based stop-loss
+    if holding_hours > max_holding_hours and pnl_percent < -0.01:
+        reason = REASON_TIME_STOP
+
+    # 4. Strong reverse signal
+    if signal_strength > 0.6:
+        if is_long and signal_code == SIGNAL_SELL:
+            reason = REASON_REVERSE_SELL
+        elif not is_long and signal_code == SIGNAL_BUY:
+            reason = REASON_REVERSE_BUY
+
+    return reason, pnl_percent, previous_max, new_max
+
+
+def warmup() -> None:
+    """Run evaluate_risk once with the bot's argument types to trigger JIT compilation"""
+    evaluate_risk(True, 1.0, 1.0, 0.0, math.nan, 0.0, 0.0, 0.03, 0.05, 0.02, 24.0, SIGNAL_HOLD, 0.0)
+
+
+__all__ = ["evaluate_risk", "warmup", "SIGNAL_CODES"]
@@ -0,0 +1,118 @@
+"""
+Shared indicator kernels.
+
+Each function takes a float64 close array and returns only the latest value(s),
+reading no more history than the recursion needs; the `*_series` variants return
+the indicator for every bar for vectorized backtests. Results match the `ta`
+indicators the strategies used before. Loops are compiled with numba when it is
+installed and run as plain Python otherwise.
+"""
+import numpy as np
+
+from _jit import njit
+
+# An adjust=False EMA keeps (1 - alpha)^n of its seed after n bars; past 10 spans
+# that is below 1e-8, so older bars are not read at all
+EMA_WARMUP_SPANS = 10
+
+
+@njit(cache=True)
+def ema_series(x: np.ndarray, span: int) -> np.ndarray:
+    """EMA over x seeded with x[0], matching pandas ewm(span, adjust=False)"""
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty(len(x))
+    ema = x[0]
+    out[0] = ema
+    for i in range(1, len(x)):
+        ema = alpha * x[i] + (1.0 - alpha) * ema
+        out[i] = ema
+    return out
+
+
+@njit(cache=True)
+def rsi(close: np.ndarray, period: int = 14) -> float:
+    """Wilder RSI at the last bar, as ta's RSIIndicator"""
+    alpha = 1.0 / period
+    # Wilder smoothing is an EMA with span 2 * period - 1
+    start = max(len(close) - EMA_WARMUP_SPANS * (2 * period - 1), 0)
+    up = 0.0
+    down = 0.0
+    for i in range(start + 1, len(close)):
+        delta = close[i] - close[i - 1]
+        up = alpha * (delta if delta > 0.0 else 0.0) + (1.0 - alpha) * up
+        down = alpha * (-delta if delta < 0.0 else 0.0) + (1.0 - alpha) * down
+    if down == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + up / down)
+
+
+@njit(cache=True)
+def rsi_series(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder RSI for every bar; NaN until `period` changes have been seen, as ta"""
+    alpha = 1.0 / period
+    out = np.full(len(close), np.nan)
+    up = 0.0
+    down = 0.0
+    for i in range(1, len(close)):
+        delta = close[i] - close[i - 1]
+        up = alpha * (delta if delta > 0.0 else 0.0) + (1.0 - alpha) * up
+        down = alpha * (-delta if delta < 0.0 else 0.0) + (1.0 - alpha) * down
+        if i >= period - 1:
+            out[i] = 100.0 if down == 0.0 else 100.0 - 100.0 / (1.0 + up / down)
+    return out
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """(macd, signal) at the last bar, as ta's MACD"""
+    start = max(len(close) - EMA_WARMUP_SPANS * (slow + signal), 0)
+    window = close[start:]
+    line = ema_series(window, fast) - ema_series(window, slow)
+    # ta's MACD line is NaN until the slow EMA has `slow` bars, so its signal starts there
+    sig = ema_series(line[slow - 1:] if start == 0 else line, signal)
+    return line[-1], sig[-1]
+
+
+def macd_series(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """(macd, signal) arrays for every bar; NaN before ta's MACD produces values"""
+    line = ema_series(close, fast) - ema_series(close, slow)
+    line[:slow - 1] = np.nan
+    sig = np.full(len(close), np.nan)
+    if len(close) >= slow:
+        sig[slow - 1:] = ema_series(line[slow - 1:], signal)
+        sig[:slow + signal - 2] = np.nan
+    return line, sig
+
+
+def bollinger(close: np.ndarray, period: int = 20, num_std: float = 2) -> tuple:
+    """(upper, middle, lower) bands at the last bar, as ta's BollingerBands (population std)"""
+    window = close[-period:]
+    middle = window.mean()
+    std = window.std()
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+def bollinger_series(close: np.ndarray, period: int = 20, num_std: float = 2) -> tuple:
+    """(upper, middle, lower) arrays for every bar; NaN for the first period - 1 bars"""
+    upper = np.full(len(close), np.nan)
+    middle = np.full(len(close), np.nan)
+    lower = np.full(len(close), np.nan)
+    if len(close) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(close, period)
+        mean = windows.mean(axis=1)
+        std = windows.std(axis=1)
+        middle[period - 1:] = mean
+        upper[period - 1:] = mean + num_std * std
+        lower[period - 1:] = mean - num_std * std
+    return upper, middle, lower
+
+
+__all__ = [
+    "EMA_WARMUP_SPANS",
+    "ema_series",
+    "rsi",
+    "rsi_series",
+    "macd",
+    "macd_series",
+    "bollinger",
+    "bollinger_series",
+]
@@ -1,14 +1,13 @@
 """
 Trading Strategy Implementations
 """
+import bisect
 import pandas as pd
 import numpy as np
-from ta.trend import MACD, EMAIndicator
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands
 from typing import Dict, Optional, List
 import time
 
+from strategies import indicators
 from strategies.trend_follow_strategies import TrendFollowingStrategy
 from strategies.test_strategy import TestStrategy
 
@@ -18,9 +17,16 @@ class BaseStrategy:
         self.config = config
         self.name = "base"
         self.positions = {}
-        self.last_trade_time = 0
+        self.last_trade_time = float('-inf')  # time.monotonic() of the last trade
         self.daily_pnl = 0
         self.trade_count = 0
+
+        # Risk limits checked on every tick, resolved once
+        risk_cfg = config.get('risk_management', {})
+        self._cool_down = risk_cfg.get('cool_down_seconds', 60)
+        self._max_trades = risk_cfg.get('max_trades_per_day', 20)
+        self._max_daily_loss = risk_cfg.get('max_daily_loss', 0.05)
+        self._position_size = config.get('trading', {}).get('position_size', 0.1)
         
     def analyze(self, df: pd.DataFrame) -> Dict:
         """Analyze market data and return trading signals"""
@@ -28,16 +34,13 @@ class BaseStrategy:
 
     def should_trade(self) -> bool:
         """Check if trading is allowed (risk management)"""
-        cool_down = self.config.get('risk_management', {}).get('cool_down_seconds', 60)
-        if time.time() - self.last_trade_time < cool_down:
+        if time.monotonic() - self.last_trade_time < self._cool_down:
             return False
         
-        max_trades = self.config.get('risk_management', {}).get('max_trades_per_day', 20)
-        if self.trade_count >= max_trades:
+        if self.trade_count >= self._max_trades:
             return False
         
-        max_loss = self.config.get('risk_management', {}).get('max_daily_loss', 0.05)
-        if self.daily_pnl < -max_loss:
+        if self.daily_pnl < -self._max_daily_loss:
             return False
         
         return True
@@ -49,6 +52,12 @@ class MomentumStrategy(BaseStrategy):
         super().__init__(config)
         self.name = "momentum"
         self.params = config.get('strategies', {}).get('momentum', {})
+        self._rsi_period = self.params.get('rsi_period', 14)
+        self._macd_fast = self.params.get('macd_fast', 12)
+        self._macd_slow = self.params.get('macd_slow', 26)
+        self._macd_signal = self.params.get('macd_signal', 9)
+        self._rsi_oversold = self.params.get('rsi_oversold', 30)
+        self._rsi_overbought = self.params.get('rsi_overbought', 70)
         
     def analyze(self, df: pd.DataFrame) -> Dict:
         """
@@ -62,31 +71,54 @@ class MomentumStrategy(BaseStrategy):
         """
         if len(df) < 50:
             return {'signal': 'hold', 'strength': 0}
-        
-        # Calculate indicators
-        rsi_period = self.params.get('rsi_period', 14)
-        rsi = RSIIndicator(df['close'], window=rsi_period).rsi()
-        
-        macd = MACD(df['close'],
-                   window_slow=self.params.get('macd_slow', 26),
-                   window_fast=self.params.get('macd_fast', 12),
-                   window_sign=self.params.get('macd_signal', 9))
-        
-        macd_line = macd.macd()
-        signal_line = macd.macd_signal()
-        
-        # Current values
-        current_rsi = rsi.iloc[-1]
-        current_macd = macd_line.iloc[-1]
-        current_signal = signal_line.iloc[-1]
-        current_price = df['close'].iloc[-1]
+        return self._evaluate(df['close'].to_numpy(dtype=np.float64))
+
+    def analyze_arrays(self, timestamps: np.ndarray, ohlcv: np.ndarray) -> Dict:
+        """Array entry point: indicators run on the close column without building a DataFrame"""
+        if len(ohlcv) < 50:
+            return {'signal': 'hold', 'strength': 0}
+        return self._evaluate(ohlcv[:, 3])
+
+    def analyze_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized analyze() for backtests: row i is what analyze() returns for the
+        bars up to i, computed for the whole history in one pass
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        rsi = indicators.rsi_series(close, self._rsi_period)
+        macd, macd_signal = indicators.macd_series(close, self._macd_fast, self._macd_slow, self._macd_signal)
+        oversold = self._rsi_oversold
+        overbought = self._rsi_overbought
+
+        warm = np.arange(len(close)) >= 49
+        buy = warm & ((rsi < oversold) | ((macd > macd_signal) & (rsi < 50)))
+        sell = warm & ~buy & ((rsi > overbought) | ((macd < macd_signal) & (rsi > 50)))
+        buy_strength = np.where(rsi < oversold, np.clip((oversold - rsi) / oversold, None, 0.8), 0.6)
+        sell_strength = np.where(rsi > overbought, np.clip((rsi - overbought) / (100 - overbought), None, 0.8), 0.6)
+        strength = np.where(buy, buy_strength, np.where(sell, sell_strength, 0.0))
+
+        return pd.DataFrame({
+            'signal': np.where(buy, 'buy', np.where(sell, 'sell', 'hold')),
+            'strength': strength,
+            'price': close,
+            'size': self._position_size * strength,
+            'rsi': rsi,
+            'macd': macd,
+            'macd_signal': macd_signal,
+        }, index=df.index)
+
+    def _evaluate(self, close: np.ndarray) -> Dict:
+        # Current indicator values
+        current_rsi = indicators.rsi(close, self._rsi_period)
+        current_macd, current_signal = indicators.macd(close, self._macd_fast, self._macd_slow, self._macd_signal)
+        current_price = close[-1]
         
         # Generate signal
         signal = 'hold'
         strength = 0
         
-        rsi_oversold = self.params.get('rsi_oversold', 30)
-        rsi_overbought = self.params.get('rsi_overbought', 70)
+        rsi_oversold = self._rsi_oversold
+        rsi_overbought = self._rsi_overbought
         
         # Buy signal: RSI oversold or MACD golden cross
         if (current_rsi < rsi_oversold) or (current_macd > current_signal and current_rsi < 50):
@@ -99,8 +131,7 @@ class MomentumStrategy(BaseStrategy):
             strength = min((current_rsi - rsi_overbought) / (100 - rsi_overbought), 0.8) if current_rsi > rsi_overbought else 0.6
         
         # Calculate position size
-        position_size = self.config.get('trading', {}).get('position_size', 0.1)
-        size = position_size * strength
+        size = self._position_size * strength
         
         return {
             'signal': signal,
@@ -121,28 +152,57 @@ class MeanReversionStrategy(BaseStrategy):
         super().__init__(config)
         self.name = "mean_reversion"
         self.params = config.get('strategies', {}).get('mean_reversion', {})
+        self._bb_period = self.params.get('bollinger_period', 20)
+        self._bb_std = self.params.get('bollinger_std', 2)
+        self._rsi_period = self.params.get('rsi_period', 14)
         
     def analyze(self, df: pd.DataFrame) -> Dict:
         if len(df) < 30:
             return {'signal': 'hold', 'strength': 0}
-        
+        return self._evaluate(df['close'].to_numpy(dtype=np.float64))
+
+    def analyze_arrays(self, timestamps: np.ndarray, ohlcv: np.ndarray) -> Dict:
+        """Array entry point: indicators run on the close column without building a DataFrame"""
+        if len(ohlcv) < 30:
+            return {'signal': 'hold', 'strength': 0}
+        return self._evaluate(ohlcv[:, 3])
+
+    def analyze_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized analyze() for backtests: row i is what analyze() returns for the
+        bars up to i, computed for the whole history in one pass
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        upper, middle, lower = indicators.bollinger_series(close, self._bb_period, self._bb_std)
+        rsi = indicators.rsi_series(close, self._rsi_period)
+
+        warm = np.arange(len(close)) >= 29
+        buy = warm & (close <= lower) & (rsi < 40)
+        sell = warm & ~buy & (close >= upper) & (rsi > 60)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            buy_strength = np.clip((lower - close) / lower * 10, None, 1.0)
+            sell_strength = np.clip((close - upper) / upper * 10, None, 1.0)
+        strength = np.where(buy, buy_strength, np.where(sell, sell_strength, 0.0))
+
+        return pd.DataFrame({
+            'signal': np.where(buy, 'buy', np.where(sell, 'sell', 'hold')),
+            'strength': strength,
+            'price': close,
+            'size': self._position_size * strength,
+            'upper_band': upper,
+            'lower_band': lower,
+            'middle_band': middle,
+            'rsi': rsi,
+        }, index=df.index)
+
+    def _evaluate(self, close: np.ndarray) -> Dict:
         # Bollinger Bands
-        bb_period = self.params.get('bollinger_period', 20)
-        bb_std = self.params.get('bollinger_std', 2)
-        
-        bb = BollingerBands(df['close'], window=bb_period, window_dev=bb_std)
-        upper_band = bb.bollinger_hband()
-        lower_band = bb.bollinger_lband()
-        middle_band = bb.bollinger_mavg()
-        
+        current_upper, current_middle, current_lower = indicators.bollinger(close, self._bb_period, self._bb_std)
+
         # RSI
-        rsi = RSIIndicator(df['close'], window=self.params.get('rsi_period', 14)).rsi()
-        
-        current_price = df['close'].iloc[-1]
-        current_upper = upper_band.iloc[-1]
-        current_lower = lower_band.iloc[-1]
-        current_middle = middle_band.iloc[-1]
-        current_rsi = rsi.iloc[-1]
+        current_rsi = indicators.rsi(close, self._rsi_period)
+
+        current_price = close[-1]
         
         signal = 'hold'
         strength = 0
@@ -157,8 +217,7 @@ class MeanReversionStrategy(BaseStrategy):
             signal = 'sell'
             strength = min((current_price - current_upper) / current_upper * 10, 1.0)
         
-        position_size = self.config.get('trading', {}).get('position_size', 0.1)
-        size = position_size * strength
+        size = self._position_size * strength
         
         return {
             'signal': signal,
@@ -181,6 +240,10 @@ class GridStrategy(BaseStrategy):
         self.name = "grid"
         self.params = config.get('strategies', {}).get('grid', {})
         self.grid_orders = []
+        # Ascending grid prices and their bounds, refreshed by setup_grid
+        self._grid_prices: List[float] = []
+        self._grid_lo = float('inf')
+        self._grid_hi = float('-inf')
         
     def setup_grid(self, current_price: float):
         """Set up the grid"""
@@ -191,32 +254,34 @@ class GridStrategy(BaseStrategy):
         upper_price = current_price * (1 + range_percent)
         lower_price = current_price * (1 - range_percent)
         
-        step = (upper_price - lower_price) / levels
-        
-        self.grid_orders = []
-        for i in range(levels + 1):
-            price = lower_price + i * step
-            self.grid_orders.append({
-                'price': price,
-                'size': order_size,
-                'type': 'buy' if price < current_price else 'sell'
-            })
+        self._grid_prices = np.linspace(lower_price, upper_price, levels + 1).tolist()
+        self.grid_orders = [
+            {'price': price, 'size': order_size, 'type': 'buy' if price < current_price else 'sell'}
+            for price in self._grid_prices
+        ]
+        self._grid_lo = self._grid_prices[0]
+        self._grid_hi = self._grid_prices[-1]
         
         return self.grid_orders
     
     def analyze(self, df: pd.DataFrame) -> Dict:
-        current_price = df['close'].iloc[-1]
-        
-        if not self.grid_orders:
-            self.setup_grid(current_price)
-        
-        # Check if we need to re-set the grid
-        prices = [order['price'] for order in self.grid_orders]
-        if current_price > max(prices) or current_price < min(prices):
+        return self._evaluate(df['close'].iloc[-1])
+
+    def analyze_arrays(self, timestamps: np.ndarray, ohlcv: np.ndarray) -> Dict:
+        """Array entry point: only the latest close is needed, so no DataFrame is built"""
+        return self._evaluate(float(ohlcv[-1, 3]))
+
+    def _evaluate(self, current_price: float) -> Dict:
+        # (Re)build the grid when there is none or the price left its range
+        if not self.grid_orders or current_price > self._grid_hi or current_price < self._grid_lo:
             self.setup_grid(current_price)
         
-        # Find the closest grid line
-        closest_order = min(self.grid_orders, key=lambda x: abs(x['price'] - current_price))
+        # Find the closest grid line: binary search, then the nearer neighbour (lower wins ties)
+        prices = self._grid_prices
+        i = bisect.bisect_left(prices, current_price)
+        if i == len(prices) or (i > 0 and current_price - prices[i - 1] <= prices[i] - current_price):
+            i -= 1
+        closest_order = self.grid_orders[i]
         
         return {
             'signal': 'grid',
@@ -226,18 +291,19 @@ class GridStrategy(BaseStrategy):
         }
 
 
+STRATEGIES: Dict[str, type] = {
+    'momentum': MomentumStrategy,
+    'mean_reversion': MeanReversionStrategy,
+    'grid': GridStrategy,
+    'trend_following': TrendFollowingStrategy,
+    'test': TestStrategy,
+}
+
+
 def get_strategy(strategy_name: str, config: Dict) -> BaseStrategy:
     """Get strategy instance"""
-    strategies = {
-        'momentum': MomentumStrategy,
-        'mean_reversion': MeanReversionStrategy,
-        'grid': GridStrategy,
-        'trend_following': TrendFollowingStrategy,
-        'test': TestStrategy
-    }
-    
-    strategy_class = strategies.get(strategy_name)
+    strategy_class = STRATEGIES.get(strategy_name)
     if not strategy_class:
-        raise ValueError(f"Unknown strategy: {strategy_name}")
+        raise ValueError(f"Unknown strategy: {strategy_name} (available: {', '.join(STRATEGIES)})")
     
     return strategy_class(config)
@@ -2,18 +2,101 @@
 """
 Testnet Trading Strategy - Relaxed Conditions for Testing
 """
+import logging
 import pandas as pd
 import numpy as np
 import time
 from typing import Dict
 
+from _jit import njit
+from strategies.indicators import EMA_WARMUP_SPANS, ema_series
+
+logger = logging.getLogger(__name__)
+
+# Condition names, in the order analyze scores them
+BUY_CONDITIONS = ('rsi_oversold', 'macd_golden_cross', 'trend_strong', 'ema_trend', 'price_position')
+SELL_CONDITIONS = ('rsi_high', 'macd_negative', 'trend_exists', 'ema_trend', 'price_position')
+
+
+def _ema_tail(close: np.ndarray, span: int) -> float:
+    return ema_series(close[-EMA_WARMUP_SPANS * span:], span)[-1]
+
+
+def _macd_tail(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """(macd, signal, previous macd, previous signal)"""
+    window = close[-EMA_WARMUP_SPANS * (slow + signal):]
+    macd = ema_series(window, fast) - ema_series(window, slow)
+    sig = ema_series(macd, signal)
+    return macd[-1], sig[-1], macd[-2], sig[-2]
+
+
+@njit(cache=True)
+def _rsi_tail(close: np.ndarray, period: int = 14) -> float:
+    """RSI from simple averages of the last `period` price changes"""
+    gain = 0.0
+    loss = 0.0
+    for i in range(len(close) - period, len(close)):
+        delta = close[i] - close[i - 1]
+        if delta > 0.0:
+            gain += delta
+        else:
+            loss -= delta
+    # Flat window is undefined (NaN), a window without losses is 100, as with pandas
+    if loss == 0.0:
+        return np.nan if gain == 0.0 else 100.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+@njit(cache=True)
+def _adx_tail(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> tuple:
+    """(adx, +DI, -DI) with simple moving averages; reads the last 2 * period bars"""
+    m = 2 * period - 1
+    offset = len(close) - m
+    tr = np.empty(m)
+    plus_dm = np.empty(m)
+    minus_dm = np.empty(m)
+    for j in range(m):
+        i = offset + j
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        plus_dm[j] = up if up > 0.0 else 0.0
+        minus_dm[j] = down if down > 0.0 else 0.0
+        tr[j] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+
+    # Sliding sums over the last `period` windows; 0/0 stays NaN like the pandas version
+    tr_sum = tr[:period].sum()
+    plus_sum = plus_dm[:period].sum()
+    minus_sum = minus_dm[:period].sum()
+    dx_sum = 0.0
+    plus_di = np.nan
+    minus_di = np.nan
+    for k in range(period):
+        if k:
+            tr_sum += tr[k + period - 1] - tr[k - 1]
+            plus_sum += plus_dm[k + period - 1] - plus_dm[k - 1]
+            minus_sum += minus_dm[k + period - 1] - minus_dm[k - 1]
+        plus_di = 100.0 * plus_sum / tr_sum if tr_sum != 0.0 else np.nan
+        minus_di = 100.0 * minus_sum / tr_sum if tr_sum != 0.0 else np.nan
+        di_sum = plus_di + minus_di
+        dx_sum += 100.0 * abs(plus_di - minus_di) / di_sum if di_sum != 0.0 else np.nan
+    return dx_sum / period, plus_di, minus_di
+
+
+def _bollinger_tail(close: np.ndarray, period: int = 20) -> tuple:
+    """(upper, middle, lower) two-sigma bands over the last `period` closes"""
+    window = close[-period:]
+    middle = window.mean()
+    std = window.std(ddof=1)
+    return middle + std * 2, middle, middle - std * 2
+
+
 class TestStrategy:
     """Test Strategy - Lower thresholds to trigger trades more easily"""
 
     def __init__(self, config: Dict):
         self.name = "test"
         self.config = config
-        self.last_trade_time = 0
+        self.last_trade_time = float('-inf')  # time.monotonic() of the last trade
         self.trade_count = 0
 
         # Test parameters - More relaxed conditions (override via config.strategies.test)
@@ -25,112 +108,97 @@ class TestStrategy:
         self.signal_threshold = cfg.get('signal_threshold', 0.5)
         self.required_conditions = cfg.get('required_conditions', 2)
 
+        # Risk limits checked on every tick, resolved once (signal cooldown keeps its own default)
+        risk_cfg = config.get('risk_management', {})
+        self._cool_down = risk_cfg.get('cool_down_seconds', 300)
+        self._signal_cool_down = risk_cfg.get('cool_down_seconds', 3600)
+        self._max_trades = risk_cfg.get('max_trades_per_day', 8)
+
     def should_trade(self) -> bool:
         """Check if trading is allowed (risk control)"""
-        cooldown = self.config.get('risk_management', {}).get('cool_down_seconds', 300)
-        if time.time() - self.last_trade_time < cooldown:
+        if time.monotonic() - self.last_trade_time < self._cool_down:
             return False
 
-        max_trades = self.config.get('risk_management', {}).get('max_trades_per_day', 8)
-        if self.trade_count >= max_trades:
+        if self.trade_count >= self._max_trades:
             return False
 
         return True
 
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
         """Calculate RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.iloc[-1]
+        return _rsi_tail(np.asarray(prices, dtype=np.float64), period)
 
     def calculate_macd(self, prices: pd.Series) -> tuple:
         """Calculate MACD"""
-        exp1 = prices.ewm(span=12, adjust=False).mean()
-        exp2 = prices.ewm(span=26, adjust=False).mean()
-        macd = exp1 - exp2
-        signal = macd.ewm(span=9, adjust=False).mean()
-        return macd.iloc[-1], signal.iloc[-1], macd.iloc[-2], signal.iloc[-2]
+        return _macd_tail(np.asarray(prices, dtype=np.float64))
 
     def calculate_adx(self, df: pd.DataFrame, period: int = 14) -> tuple:
         """Calculate ADX"""
-        high = df['high']
-        low = df['low']
-        close = df['close']
-
-        plus_dm = high.diff()
-        minus_dm = -low.diff()
-        plus_dm[plus_dm < 0] = 0
-        minus_dm[minus_dm < 0] = 0
-
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-
-        plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
-
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.rolling(window=period).mean()
-
-        return adx.iloc[-1], plus_di.iloc[-1], minus_di.iloc[-1]
+        return _adx_tail(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            period,
+        )
 
     def calculate_ema(self, prices: pd.Series, period: int) -> float:
         """Calculate EMA"""
-        return prices.ewm(span=period, adjust=False).mean().iloc[-1]
+        return _ema_tail(np.asarray(prices, dtype=np.float64), period)
 
     def calculate_bollinger_bands(self, prices: pd.Series, period: int = 20) -> tuple:
         """Calculate Bollinger Bands"""
-        sma = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
-        upper = sma + (std * 2)
-        middle = sma
-        lower = sma - (std * 2)
-        return upper.iloc[-1], middle.iloc[-1], lower.iloc[-1]
+        return _bollinger_tail(np.asarray(prices, dtype=np.float64), period)
 
     def analyze(self, df: pd.DataFrame) -> Dict:
         """Analyze the market and generate trading signals"""
         if len(df) < 100:
             return {'signal': 'hold', 'strength': 0}
+        return self._evaluate(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+        )
+
+    def analyze_arrays(self, timestamps: np.ndarray, ohlcv: np.ndarray) -> Dict:
+        """Array entry point: indicators run on the candle columns without building a DataFrame"""
+        if len(ohlcv) < 100:
+            return {'signal': 'hold', 'strength': 0}
+        return self._evaluate(ohlcv[:, 1], ohlcv[:, 2], ohlcv[:, 3])
 
-        close = df['close']
-        current_price = close.iloc[-1]
+    def _evaluate(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict:
+        current_price = close[-1]
 
-        # Calculate indicators
-        rsi = self.calculate_rsi(close)
-        macd, signal, prev_macd, prev_signal = self.calculate_macd(close)
-        adx, plus_di, minus_di = self.calculate_adx(df)
+        # Calculate indicators (each only reads the tail it needs)
+        rsi = _rsi_tail(close)
+        macd, signal, prev_macd, prev_signal = _macd_tail(close)
+        adx, plus_di, minus_di = _adx_tail(high, low, close)
 
-        ema_short = self.calculate_ema(close, 10)
-        ema_long = self.calculate_ema(close, 50)
+        ema_short = _ema_tail(close, 10)
+        ema_long = _ema_tail(close, 50)
 
-        bb_upper, bb_middle, bb_lower = self.calculate_bollinger_bands(close)
+        bb_upper, bb_middle, bb_lower = _bollinger_tail(close)
         bb_width = (bb_upper - bb_lower) / bb_middle
 
         # Buy conditions (adjusted: bottom-fishing during a downtrend)
-        buy_conditions = {
-            'rsi_oversold': rsi < self.rsi_oversold,          # RSI < 40
-            'macd_golden_cross': macd > prev_macd,             # MACD trending up (no golden cross required)
-            'trend_strong': adx > self.adx_threshold,          # ADX > 15
-            'ema_trend': ema_short > ema_long * 0.98,          # MAs close (2% tolerance)
-            'price_position': current_price < bb_lower * 1.02  # Price near lower band (+2% tolerance)
-        }
+        buy_conditions = (
+            rsi < self.rsi_oversold,          # rsi_oversold: RSI < 40
+            macd > prev_macd,                 # macd_golden_cross: MACD trending up (no golden cross required)
+            adx > self.adx_threshold,         # trend_strong: ADX > 15
+            ema_short > ema_long * 0.98,      # ema_trend: MAs close (2% tolerance)
+            current_price < bb_lower * 1.02,  # price_position: Price near lower band (+2% tolerance)
+        )
 
         # Sell conditions (relaxed)
-        sell_conditions = {
-            'rsi_high': rsi > self.rsi_overbought,       # RSI > 60
-            'macd_negative': macd < prev_macd,            # MACD trending down
-            'trend_exists': adx > self.adx_threshold,     # ADX > 15
-            'ema_trend': ema_short < ema_long,            # Bearish MAs
-            'price_position': current_price > bb_middle   # Price > BB middle band
-        }
+        sell_conditions = (
+            rsi > self.rsi_overbought,        # rsi_high: RSI > 60
+            macd < prev_macd,                 # macd_negative: MACD trending down
+            adx > self.adx_threshold,         # trend_exists: ADX > 15
+            ema_short < ema_long,             # ema_trend: Bearish MAs
+            current_price > bb_middle,        # price_position: Price > BB middle band
+        )
 
-        buy_score = sum(buy_conditions.values())
-        sell_score = sum(sell_conditions.values())
+        buy_score = sum(buy_conditions)
+        sell_score = sum(sell_conditions)
 
         signal_type = 'hold'
         strength = 0
@@ -148,11 +216,10 @@ class TestStrategy:
             if strength < self.signal_threshold:
                 signal_type = 'hold'
 
-            cooldown = self.config.get('risk_management', {}).get('cool_down_seconds', 3600)
-            if time.time() - self.last_trade_time < cooldown:
+            if time.monotonic() - self.last_trade_time < self._signal_cool_down:
                 signal_type = 'hold'
 
-        return {
+        result = {
             'signal': signal_type,
             'strength': strength,
             'price': current_price,
@@ -170,9 +237,13 @@ class TestStrategy:
                 'bb_middle': bb_middle,
                 'bb_lower': bb_lower,
                 'bb_width': bb_width
-            },
-            'conditions': {
-                'buy': buy_conditions,
-                'sell': sell_conditions
             }
         }
+
+        # Named conditions only feed the INFO analysis log; skip building them otherwise
+        if logger.isEnabledFor(logging.INFO):
+            result['conditions'] = {
+                'buy': dict(zip(BUY_CONDITIONS, buy_conditions)),
+                'sell': dict(zip(SELL_CONDITIONS, sell_conditions))
+            }
+        return result
@@ -4,14 +4,99 @@ Low-Frequency Trading Strategy - Optimized for Fees
 import pandas as pd
 import numpy as np
 import logging
-from ta.trend import MACD, EMAIndicator, ADXIndicator
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands, AverageTrueRange
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, Optional
 import time
 
 logger = logging.getLogger(__name__)
 
+ADX_WINDOW = 14
+# EMA spans: trend fast/mid/slow, then the MACD fast/slow lines
+EMA_SPANS = (20, 50, 200, 12, 26)
+_EMA_ALPHAS = tuple(2.0 / (span + 1.0) for span in EMA_SPANS)
+
+# Cached indicator states are looked up by their last closed bar; a state is
+# resumed if that bar is at most this many rows from the end of the buffer
+_MAX_RESUME_BARS = 8
+# Cached states kept across symbols before the oldest is evicted
+_MAX_STATES = 64
+
+
+@dataclass(slots=True)
+class _TrendState:
+    """
+    Indicator state after one bar, using ta's EMA/ADX/MACD recursions.
+
+    Replayed over a buffer from its first bar it equals ta on that buffer. A state
+    resumed from the cache also carries the history of bars that have since rolled
+    out of the buffer, so it equals ta on the full series seen so far rather than
+    on the current window.
+    """
+    bars: int
+    high: float
+    low: float
+    close: float
+    emas: tuple
+    trs: float = 0.0
+    dip: float = 0.0
+    din: float = 0.0
+    plus_di: float = 0.0
+    minus_di: float = 0.0
+    dx_sum: float = 0.0
+    adx: float = 0.0
+
+
+def _first_state(high: float, low: float, close: float) -> _TrendState:
+    return _TrendState(bars=1, high=high, low=low, close=close, emas=(close,) * len(EMA_SPANS))
+
+
+def _step(s: _TrendState, high: float, low: float, close: float) -> _TrendState:
+    """Advance the state by one bar without mutating it"""
+    w = ADX_WINDOW
+    b = s.bars  # index of the new bar
+    emas = tuple(a * close + (1.0 - a) * e for a, e in zip(_EMA_ALPHAS, s.emas))
+
+    tr = max(high, s.close) - min(low, s.close)
+    up = high - s.high
+    down = s.low - low
+    pos = up if up > down and up > 0 else 0.0
+    neg = down if down > up and down > 0 else 0.0
+
+    # Wilder sums are seeded with the plain sum of bars 1..w
+    if b <= w:
+        trs, dip, din = s.trs + tr, s.dip + pos, s.din + neg
+    else:
+        trs = s.trs - s.trs / w + tr
+        dip = s.dip - s.dip / w + pos
+        din = s.din - s.din / w + neg
+
+    plus_di = minus_di = dx_sum = adx = 0.0
+    if b >= w:
+        plus_di = 100 * dip / trs if trs != 0 else 0.0
+        minus_di = 100 * din / trs if trs != 0 else 0.0
+        di_sum = plus_di + minus_di
+        dx = 100 * abs((plus_di - minus_di) / di_sum) if di_sum != 0 else 0.0
+        # ADX is seeded with the mean DX of its first w bars, then smoothed
+        if b < 2 * w - 1:
+            dx_sum = s.dx_sum + dx
+        elif b == 2 * w - 1:
+            adx = (s.dx_sum + dx) / w
+        else:
+            adx = (s.adx * (w - 1) + dx) / w
+
+    return _TrendState(b + 1, high, low, close, emas, trs, dip, din, plus_di, minus_di, dx_sum, adx)
+
+
+def _replay(high: np.ndarray, low: np.ndarray, close: np.ndarray, state: Optional[_TrendState] = None) -> _TrendState:
+    """Fold bars into `state` (or start a fresh one at the first bar)"""
+    start = 0
+    if state is None:
+        state = _first_state(float(high[0]), float(low[0]), float(close[0]))
+        start = 1
+    for i in range(start, len(close)):
+        state = _step(state, float(high[i]), float(low[i]), float(close[i]))
+    return state
+
 class TrendFollowingStrategy:
     """
     Pure Trend-Following Strategy - Only trade in clear trends
@@ -28,18 +113,25 @@ class TrendFollowingStrategy:
         self.name = "trend_following"
         self.params = config.get('strategies', {}).get('trend_following', {})
         self.positions = {}
-        self.last_trade_time = 0
+        self.last_trade_time = float('-inf')  # time.monotonic() of the last trade
         self.daily_pnl = 0
         self.trade_count = 0
+        self._max_trades = config.get('risk_management', {}).get('max_trades_per_day', 3)  # Maximum 3 trades per day
+        self._position_size = config.get('trading', {}).get('position_size', 0.15)
+        # Closed-bar indicator states keyed by (timestamp, close) of their last bar
+        self._states: Dict[tuple, _TrendState] = {}
+
+    def reset_state(self) -> None:
+        """Forget cached indicator states so the next analysis recomputes from its buffer"""
+        self._states.clear()
 
     def should_trade(self) -> bool:
         """More strict trade frequency control"""
         # At least 4 hours before trading again
-        if time.time() - self.last_trade_time < 14400:
+        if time.monotonic() - self.last_trade_time < 14400:
             return False
 
-        max_trades = self.config.get('risk_management', {}).get('max_trades_per_day', 3)  # Maximum 3 trades per day
-        if self.trade_count >= max_trades:
+        if self.trade_count >= self._max_trades:
             return False
 
         return True
@@ -51,29 +143,57 @@ class TrendFollowingStrategy:
         if len(df) < 200:
             return {'signal': 'hold', 'strength': 0}
 
-        # Multi-period moving averages
-        ema_fast = EMAIndicator(df['close'], window=20).ema_indicator()
-        ema_mid = EMAIndicator(df['close'], window=50).ema_indicator()
-        ema_slow = EMAIndicator(df['close'], window=200).ema_indicator()
-
-        # ADX
-        adx = ADXIndicator(df['high'], df['low'], df['close'], window=14)
-        adx_value = adx.adx()
-        adx_pos = adx.adx_pos()
-        adx_neg = adx.adx_neg()
-
-        # MACD
-        macd = MACD(df['close'], window_slow=26, window_fast=12, window_sign=9)
-        macd_line = macd.macd()
-
-        current_price = df['close'].iloc[-1]
-        current_ema_fast = ema_fast.iloc[-1]
-        current_ema_mid = ema_mid.iloc[-1]
-        current_ema_slow = ema_slow.iloc[-1]
-        current_adx = adx_value.iloc[-1]
-        current_adx_pos = adx_pos.iloc[-1]
-        current_adx_neg = adx_neg.iloc[-1]
-        current_macd = macd_line.iloc[-1]
+        ohlcv = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+        if 'timestamp' not in df:
+            return self._evaluate(ohlcv[-1, 3], _replay(ohlcv[:, 1], ohlcv[:, 2], ohlcv[:, 3]))
+        timestamps = df['timestamp'].to_numpy().astype(np.int64)
+        return self._evaluate(ohlcv[-1, 3], self._live_state(timestamps, ohlcv))
+
+    def analyze_arrays(self, timestamps: np.ndarray, ohlcv: np.ndarray) -> Dict:
+        """Array entry point: advances cached indicator state instead of recomputing the window"""
+        if len(ohlcv) < 200:
+            return {'signal': 'hold', 'strength': 0}
+        return self._evaluate(ohlcv[-1, 3], self._live_state(timestamps, ohlcv))
+
+    def _live_state(self, timestamps: np.ndarray, ohlcv: np.ndarray) -> _TrendState:
+        """
+        Indicator state at the last (possibly still forming) bar.
+
+        Closed bars are folded into a cached state once; each tick only steps
+        that state over the newest bar. Buffers are told apart by their last
+        closed bar, so one strategy instance can serve several symbols.
+
+        Results therefore depend on call history: once a rolling buffer has
+        dropped bars, the EMAs (notably EMA-200) and ADX keep their earlier
+        history and differ from a fresh computation on the window alone.
+        Call reset_state() to start over, e.g. before reusing an instance
+        for another backtest.
+        """
+        high, low, close = ohlcv[:, 1], ohlcv[:, 2], ohlcv[:, 3]
+        n = len(close)
+
+        state = None
+        for back in range(2, min(n, _MAX_RESUME_BARS) + 1):
+            state = self._states.pop((int(timestamps[-back]), float(close[-back])), None)
+            if state is not None:
+                state = _replay(high[n - back + 1:n - 1], low[n - back + 1:n - 1], close[n - back + 1:n - 1], state)
+                break
+        else:
+            state = _replay(high[:-1], low[:-1], close[:-1])
+
+        self._states[(int(timestamps[-2]), float(close[-2]))] = state
+        if len(self._states) > _MAX_STATES:
+            del self._states[next(iter(self._states))]
+
+        return _step(state, float(high[-1]), float(low[-1]), float(close[-1]))
+
+    def _evaluate(self, current_price: float, state: _TrendState) -> Dict:
+        current_price = float(current_price)
+        current_ema_fast, current_ema_mid, current_ema_slow, ema_macd_fast, ema_macd_slow = state.emas
+        current_adx = state.adx
+        current_adx_pos = state.plus_di
+        current_adx_neg = state.minus_di
+        current_macd = ema_macd_fast - ema_macd_slow
 
         signal = 'hold'
         strength = 0
@@ -96,13 +216,11 @@ class TrendFollowingStrategy:
             signal = 'sell'
             strength = 0.9
 
-        position_size = self.config.get('trading', {}).get('position_size', 0.15)
-
         return {
             'signal': signal,
             'strength': strength,
             'price': current_price,
-            'size': position_size * strength,
+            'size': self._position_size * strength,
             'indicators': {
                 'ema_fast': current_ema_fast,
                 'ema_mid': current_ema_mid,
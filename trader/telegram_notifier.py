@@ -1,18 +1,83 @@
 """
 Telegram Notification Module
 """
+import collections
+import functools
+import html
+import queue
+import random
+import threading
+import time
 import requests
 import logging
-from typing import Optional, Dict
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, List
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+except ImportError:  # stdlib fallback
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 logger = logging.getLogger(__name__)
 
 
+class _MessageRejected(Exception):
+    """Telegram refused a message with a non-retryable 4xx status"""
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"status={status}: {detail}")
+        self.status = status
+
+# Messages held for the background sender before new ones are dropped
+SEND_QUEUE_SIZE = 256
+# Attempts per message, and the longest single wait between them (seconds)
+SEND_MAX_ATTEMPTS = 4
+SEND_MAX_BACKOFF = 30.0
+# After this many consecutive network/5xx failures, messages are dropped for CIRCUIT_COOLDOWN seconds
+CIRCUIT_FAILURES = 5
+CIRCUIT_COOLDOWN = 60.0
+# Default (connect, read) timeouts: an unreachable endpoint fails fast, a slow reply still completes
+CONNECT_TIMEOUT = 3.0
+READ_TIMEOUT = 8.0
+
+# Messages arriving within BATCH_WINDOW seconds of each other are joined into one send
+# (up to BATCH_MAX messages and Telegram's MESSAGE_MAX_CHARS per message)
+BATCH_WINDOW = 0.5
+BATCH_MAX = 10
+MESSAGE_MAX_CHARS = 4096
+BATCH_SEPARATOR = "\n\n━━━\n\n"
+
+# Identical signals/errors within this many seconds are sent once; at most DEDUP_MAX keys are remembered
+DEDUP_WINDOW = 30.0
+DEDUP_MAX = 256
+
+# Timestamp formats in message footers (local time)
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_FORMAT = '%Y-%m-%d'
+
+# Emoji per trade signal type
+_SIGNAL_EMOJI = {
+    'BUY': '🟢',
+    'SELL': '🔴',
+    'HOLD': '⚪'
+}
+
+
+def _format_time(ts: Optional[float] = None, fmt: str = TIME_FORMAT) -> str:
+    """Local time of `ts` (epoch seconds; now when omitted) for message footers"""
+    return time.strftime(fmt, time.localtime(ts))
+
+
 class TelegramNotifier:
     """Telegram Notifier"""
 
-    def __init__(self, bot_token: str, chat_id: str, enabled: bool = True):
+    def __init__(self, bot_token: str, chat_id: str, enabled: bool = True,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT):
         """
         Initialize the Telegram Notifier
 
@@ -20,50 +85,215 @@ class TelegramNotifier:
             bot_token: Telegram Bot Token
             chat_id: Chat ID to receive messages
             enabled: Whether to enable notifications
+            connect_timeout: Seconds to wait for the connection to Telegram
+            read_timeout: Seconds to wait for Telegram's reply
         """
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.enabled = enabled
+        self._timeout = (connect_timeout, read_timeout)
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self._send_url = f"{self.base_url}/sendMessage"
+
+        # Keep-alive session so each notification skips the TCP/TLS handshake; the single
+        # sender worker only ever needs one pooled connection. Retries are done in _post_sync.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0))
+        # Bodies are posted as pre-serialized JSON bytes; every template is HTML
+        self._session.headers["Content-Type"] = "application/json"
+        self._static = {"chat_id": chat_id, "parse_mode": "HTML"}
+
+        # Messages are posted by a background worker so a slow Telegram never stalls the trading loop
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        # Circuit breaker state, only touched by the worker
+        self._fail_count = 0
+        self._open_until = 0.0
+
+        # Recently sent signal/error keys -> monotonic send time, oldest first
+        self._recent: "collections.OrderedDict[tuple, float]" = collections.OrderedDict()
+        self._recent_lock = threading.Lock()
 
         if enabled:
             logger.info(f"Telegram notifications enabled | Chat ID: {chat_id}")
         else:
             logger.info("Telegram notifications disabled")
 
-    def _send_message(self, text: str, parse_mode: str = "HTML") -> bool:
+    def _send_message(self, text: str) -> bool:
         """
-        Send a Telegram message
+        Queue a Telegram message for the background sender
 
         Args:
-            text: Message content
-            parse_mode: Parsing mode (HTML/Markdown)
+            text: Message content (HTML)
 
         Returns:
-            Whether the message was sent successfully
+            Whether the message was queued (delivery is best-effort)
         """
         if not self.enabled:
             return False
 
+        self._ensure_worker()
         try:
-            url = f"{self.base_url}/sendMessage"
-            payload = {
-                "chat_id": self.chat_id,
-                "text": text,
-                "parse_mode": parse_mode
-            }
-
-            response = requests.post(url, json=payload, timeout=10)
-            response.raise_for_status()
-
+            self._queue.put_nowait(text)
             return True
+        except queue.Full:
+            logger.warning("Telegram send queue full; dropping message")
+            return False
 
-        except Exception as e:
-            logger.error(f"Failed to send Telegram message: {e}")
+    def _is_duplicate(self, key: tuple) -> bool:
+        """True if `key` was sent within DEDUP_WINDOW; otherwise records it as sent now"""
+        now = time.monotonic()
+        with self._recent_lock:
+            sent_at = self._recent.get(key)
+            if sent_at is not None and now - sent_at < DEDUP_WINDOW:
+                return True
+            self._recent[key] = now
+            self._recent.move_to_end(key)
+            if len(self._recent) > DEDUP_MAX:
+                self._recent.popitem(last=False)
+        return False
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._send_loop, name="tg-notify", daemon=True)
+                self._worker.start()
+
+    def _send_loop(self) -> None:
+        while True:
+            text = self._queue.get()
+            if text is None:  # close() sentinel
+                return
+            batch = [text]
+            closing = False
+            while len(batch) < BATCH_MAX:
+                try:
+                    text = self._queue.get(timeout=BATCH_WINDOW)
+                except queue.Empty:
+                    break
+                if text is None:
+                    closing = True
+                    break
+                batch.append(text)
+            for group in self._coalesce(batch):
+                self._deliver(group)
+            if closing:
+                return
+
+    @staticmethod
+    def _coalesce(batch: List[str]) -> List[List[str]]:
+        """Group consecutive messages while their joined text fits in one Telegram message"""
+        groups = [[batch[0]]]
+        size = len(batch[0])
+        for text in batch[1:]:
+            size += len(BATCH_SEPARATOR) + len(text)
+            if size <= MESSAGE_MAX_CHARS:
+                groups[-1].append(text)
+            else:
+                groups.append([text])
+                size = len(text)
+        return groups
+
+    def _deliver(self, group: List[str]) -> None:
+        """Send a group as one message; if Telegram rejects the merged text (400), send its messages one by one"""
+        try:
+            self._post_sync(BATCH_SEPARATOR.join(group))
+            return
+        except _MessageRejected as e:
+            if len(group) == 1 or e.status != 400:
+                logger.error(f"Telegram rejected message ({e})")
+                return
+            logger.warning(f"Telegram rejected a batch of {len(group)} messages ({e}); resending individually")
+        for text in group:
+            try:
+                self._post_sync(text)
+            except _MessageRejected as e:
+                logger.error(f"Telegram rejected message ({e})")
+
+    def _post_sync(self, text: str) -> bool:
+        """
+        POST one message, retrying rate limits (429, honoring retry_after), 5xx and
+        network errors with capped exponential backoff; runs on the worker thread.
+        Raises _MessageRejected for other 4xx replies, which retrying cannot fix.
+        """
+        if time.monotonic() < self._open_until:
+            logger.debug("Telegram circuit open; dropping message")
             return False
 
-    def notify_startup(self, strategy: str, symbol: str, test_mode: bool = False):
+        body = _dumps({**self._static, "text": text})
+        for attempt in range(1, SEND_MAX_ATTEMPTS + 1):
+            delay = min(2 ** (attempt - 1) + random.random(), SEND_MAX_BACKOFF)
+            # Rate limiting is not an outage, so it does not count toward the circuit breaker
+            outage = True
+            try:
+                response = self._session.post(self._send_url, data=body, timeout=self._timeout)
+            except requests.Timeout as e:
+                error = f"timeout: {e}"
+            except requests.ConnectionError as e:
+                error = f"connection error: {e}"
+            except requests.RequestException as e:
+                logger.error(f"Failed to send Telegram message (attempt={attempt}): {e}")
+                return False
+            else:
+                status = response.status_code
+                if status < 400:
+                    self._fail_count = 0
+                    return True
+                if status == 429:
+                    retry_after = self._retry_after(response)
+                    delay = min(retry_after or delay, SEND_MAX_BACKOFF)
+                    error = f"status=429 retry_after={retry_after}"
+                    outage = False
+                elif status >= 500:
+                    error = f"status={status}"
+                else:
+                    raise _MessageRejected(status, response.text[:200])
+
+            if outage:
+                self._fail_count += 1
+            if self._fail_count >= CIRCUIT_FAILURES:
+                self._fail_count = 0
+                self._open_until = time.monotonic() + CIRCUIT_COOLDOWN
+                logger.error(
+                    f"Telegram unreachable ({error}); dropping notifications for {CIRCUIT_COOLDOWN:.0f}s"
+                )
+                return False
+
+            if attempt < SEND_MAX_ATTEMPTS:
+                logger.warning(f"Telegram send failed ({error} attempt={attempt}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        logger.error(f"Failed to send Telegram message after {SEND_MAX_ATTEMPTS} attempts: {error}")
+        return False
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Seconds Telegram asks us to wait, from the Retry-After header or the JSON body"""
+        header = response.headers.get("Retry-After")
+        if header and header.isdigit():
+            return float(header)
+        try:
+            return float(response.json()["parameters"]["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush queued messages (up to `timeout` seconds); later messages start a new worker"""
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            try:
+                self._queue.put(None, timeout=timeout)
+                worker.join(timeout)
+            except queue.Full:
+                logger.warning("Telegram send queue still full at shutdown; pending messages dropped")
+
+    def notify_startup(self, strategy: str, symbol: str, test_mode: bool = False, ts: Optional[float] = None):
         """Startup Notification"""
+        if not self.enabled:
+            return False
+
         mode = "🧪 Test Mode" if test_mode else "🚀 Live Mode"
 
         text = f"""
@@ -72,28 +302,27 @@ class TelegramNotifier:
 📊 <b>Strategy:</b> {strategy}
 💰 <b>Symbol:</b> {symbol}
 ⚙️ <b>Mode:</b> {mode}
-🕐 <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+🕐 <b>Time:</b> {_format_time(ts)}
 
 The bot is now running...
 """
         return self._send_message(text)
 
-    def notify_trade_signal(self, symbol: str, signal: Dict, current_price: float):
+    def notify_trade_signal(self, symbol: str, signal: Dict, current_price: float, ts: Optional[float] = None):
         """Trade Signal Notification"""
-        signal_type = signal['signal'].upper()
-        strength = signal['strength']
-
-        # Choose emoji based on signal type
-        emoji_map = {
-            'BUY': '🟢',
-            'SELL': '🔴',
-            'HOLD': '⚪'
-        }
-        emoji = emoji_map.get(signal_type, '⚪')
+        if not self.enabled:
+            return False
 
+        signal_type = signal['signal'].upper()
         if signal_type == 'HOLD':
             return False  # Do not send HOLD signals
 
+        if self._is_duplicate((signal_type, symbol, round(current_price, 2))):
+            return False
+
+        strength = signal['strength']
+        emoji = _SIGNAL_EMOJI.get(signal_type, '⚪')
+
         indicators = signal.get('indicators', {})
         rsi = indicators.get('rsi', 0)
         macd = indicators.get('macd', 0)
@@ -111,13 +340,16 @@ The bot is now running...
 • MACD: {macd:.2f}
 • Signal: {macd_signal:.2f}
 
-🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+🕐 {_format_time(ts)}
 """
         return self._send_message(text)
 
     def notify_trade_executed(self, symbol: str, trade_type: str, size: float,
-                             price: float, test_mode: bool = False):
+                             price: float, test_mode: bool = False, ts: Optional[float] = None):
         """Trade Execution Notification"""
+        if not self.enabled:
+            return False
+
         mode_tag = "[Test] " if test_mode else ""
         emoji = "🟢" if trade_type.upper() == 'BUY' else "🔴"
 
@@ -130,13 +362,17 @@ The bot is now running...
 💵 <b>Price:</b> ${price:,.2f}
 💸 <b>Amount:</b> ${size * price:,.2f}
 
-🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+🕐 {_format_time(ts)}
 """
         return self._send_message(text)
 
     def notify_position_closed(self, symbol: str, entry_price: float, exit_price: float,
-                              pnl: float, pnl_percent: float, reason: str, test_mode: bool = False):
+                              pnl: float, pnl_percent: float, reason: str, test_mode: bool = False,
+                              ts: Optional[float] = None):
         """Position Closure Notification"""
+        if not self.enabled:
+            return False
+
         mode_tag = "[Test] " if test_mode else ""
 
         # Choose emoji based on profit/loss
@@ -155,25 +391,34 @@ The bot is now running...
 📉 <b>Exit Price:</b> ${exit_price:,.2f}
 
 💸 <b>Profit/Loss:</b> {pnl_text} ({pnl_percent:+.2%})
-📝 <b>Reason:</b> {reason}
+📝 <b>Reason:</b> {html.escape(reason)}
 
-🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+🕐 {_format_time(ts)}
 """
         return self._send_message(text)
 
-    def notify_error(self, error_msg: str):
+    def notify_error(self, error_msg: str, ts: Optional[float] = None):
         """Error Notification"""
+        if not self.enabled:
+            return False
+
+        if self._is_duplicate(("error", error_msg)):
+            return False
+
         text = f"""
 ⚠️ <b>Error Warning</b>
 
-{error_msg}
+{html.escape(error_msg)}
 
-🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+🕐 {_format_time(ts)}
 """
         return self._send_message(text)
 
-    def notify_daily_summary(self, stats: Dict):
+    def notify_daily_summary(self, stats: Dict, ts: Optional[float] = None):
         """Daily Summary Notification"""
+        if not self.enabled:
+            return False
+
         trades = stats.get('trades_today', 0)
         pnl = stats.get('pnl_today', 0)
         win_rate = stats.get('win_rate', 0)
@@ -189,26 +434,32 @@ The bot is now running...
 📊 <b>Win Rate:</b> {win_rate:.1%}
 💵 <b>Current Balance:</b> ${balance:,.2f}
 
-📅 {datetime.now().strftime('%Y-%m-%d')}
+📅 {_format_time(ts, DATE_FORMAT)}
 """
         return self._send_message(text)
 
-    def notify_risk_warning(self, warning_type: str, details: str):
+    def notify_risk_warning(self, warning_type: str, details: str, ts: Optional[float] = None):
         """Risk Warning"""
+        if not self.enabled:
+            return False
+
         text = f"""
 🚨 <b>Risk Warning</b>
 
-⚠️ <b>Type:</b> {warning_type}
-📝 <b>Details:</b> {details}
+⚠️ <b>Type:</b> {html.escape(warning_type)}
+📝 <b>Details:</b> {html.escape(details)}
 
 Please manage your risk!
 
-🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+🕐 {_format_time(ts)}
 """
         return self._send_message(text)
 
-    def notify_shutdown(self, stats: Dict):
+    def notify_shutdown(self, stats: Dict, ts: Optional[float] = None):
         """Shutdown Notification"""
+        if not self.enabled:
+            return False
+
         text = f"""
 🛑 <b>Trading Bot Stopped</b>
 
@@ -217,7 +468,7 @@ Please manage your risk!
 • Total Profit/Loss: ${stats.get('total_pnl', 0):+,.2f}
 • Win Rate: {stats.get('win_rate', 0):.1%}
 
-🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+🕐 {_format_time(ts)}
 """
         return self._send_message(text)
 
@@ -243,4 +494,16 @@ def get_notifier(config: Dict) -> Optional[TelegramNotifier]:
         logger.warning("Telegram config incomplete, notifications disabled")
         return None
     
-    return TelegramNotifier(bot_token, chat_id, enabled=True)
+    return _build_notifier(
+        bot_token,
+        chat_id,
+        float(telegram_config.get('connect_timeout', CONNECT_TIMEOUT)),
+        float(telegram_config.get('read_timeout', READ_TIMEOUT)),
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _build_notifier(bot_token: str, chat_id: str, connect_timeout: float, read_timeout: float) -> TelegramNotifier:
+    """One notifier per (bot_token, chat_id, timeouts), shared across bot instances"""
+    return TelegramNotifier(bot_token, chat_id, enabled=True,
+                            connect_timeout=connect_timeout, read_timeout=read_timeout)
@@ -7,6 +7,11 @@ import requests
 import json
 import time
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # stdlib fallback
+    json_loads = json.loads
+
 print("=" * 60)
 print("🤖 Telegram Notification Configuration Helper")
 print("=" * 60)
@@ -42,11 +47,18 @@ Step 2: Get the Chat ID
 
 input("Press Enter to continue...")
 
+# One keep-alive session for getUpdates and the test sendMessage
+session = requests.Session()
+base_url = f"https://api.telegram.org/bot{bot_token}"
+# (connect, read): fail fast when Telegram is unreachable
+TIMEOUT = (3, 8)
+
 # Fetch updates
 try:
-    url = f"https://api.telegram.org/bot{bot_token}/getUpdates"
-    response = requests.get(url, timeout=10)
-    data = response.json()
+    # Only the most recent message update is needed to find the chat
+    params = {"offset": -1, "limit": 1, "timeout": 0, "allowed_updates": '["message"]'}
+    response = session.get(f"{base_url}/getUpdates", params=params, timeout=TIMEOUT)
+    data = json_loads(response.content)
 
     if not data.get('ok'):
         print(f"❌ Failed to fetch updates: {data.get('description')}")
@@ -69,18 +81,18 @@ try:
 
     # Test sending a message
     print("\nTesting message sending...")
-    test_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     test_payload = {
         "chat_id": chat_id,
         "text": "🎉 Congratulations! Telegram notification setup is successful!\n\nThe trading bot is ready."
     }
 
-    test_response = requests.post(test_url, json=test_payload, timeout=10)
+    test_response = session.post(f"{base_url}/sendMessage", json=test_payload, timeout=TIMEOUT)
 
-    if test_response.json().get('ok'):
+    test_result = json_loads(test_response.content)
+    if test_result.get('ok'):
         print("✅ Test message sent successfully! Check Telegram.")
     else:
-        print(f"⚠️ Test message failed: {test_response.json()}")
+        print(f"⚠️ Test message failed: {test_result}")
 
     # Output configuration
     print("\n" + "=" * 60)